@@ -1,6 +1,10 @@
 """Discord webhook integration."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Optional
 from signals.detector import Signal
 from config import DiscordConfig
 
@@ -8,19 +12,68 @@ from config import DiscordConfig
 class DiscordNotifier:
     """Discord webhook notification handler."""
     
-    def __init__(self, config: Optional[DiscordConfig]):
+    # Discord rejects message content over 2000 characters; leave room for code fences
+    MAX_CONTENT_LENGTH = 1900
+    
+    def __init__(self, config: Optional[DiscordConfig], flush_interval: float = 2.0, max_batch_size: int = 10):
         """
         Initialize Discord notifier.
         
         Args:
             config: Discord configuration (None if disabled)
+            flush_interval: Seconds to wait before posting queued alerts
+            max_batch_size: Number of queued alerts that triggers an immediate post
         """
         self.config = config
         self.enabled = config is not None and config.enabled and config.webhook_url is not None
+        
+        # Reuse one keep-alive connection for all webhook posts instead of a new TCP/TLS handshake per alert
+        self._session = requests.Session()
+        retries = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries))
+        
+        # Alerts queued for the next batched post
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        # Set by close(); later alerts are dropped since the executor no longer accepts posts
+        self._closed = False
+        
+        # Webhook posts run in the background so network latency never stalls signal detection
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="discord")
     
-    def send_alert(self, message: str) -> bool:
+    def send_alert(self, message: str) -> Optional[Future]:
         """
-        Send alert message to Discord.
+        Send alert message to Discord without blocking the caller.
+        
+        Args:
+            message: Alert message to send
+            
+        Returns:
+            Future resolving to True if sent successfully (None if disabled)
+        """
+        if not self.enabled or not self.config:
+            return None
+        
+        with self._lock:
+            if self._closed:
+                print("Discord notifier is closed; dropping alert")
+                return None
+            future = self._executor.submit(self._send_alert_sync, message)
+        future.add_done_callback(self._log_failure)
+        return future
+    
+    def _send_alert_sync(self, message: str) -> bool:
+        """
+        Send alert message to Discord, blocking until the post completes.
         
         Args:
             message: Alert message to send
@@ -31,13 +84,111 @@ class DiscordNotifier:
         if not self.enabled or not self.config:
             return False
         
+        success = True
+        for piece in self._split_message(message):
+            success = self._post(f"```\n{piece}\n```") and success
+        return success
+    
+    def queue_alert(self, message: str):
+        """
+        Queue alert message to be posted together with other pending alerts.
+        
+        Pending alerts are flushed after flush_interval seconds, or immediately
+        once max_batch_size alerts are waiting.
+        
+        Args:
+            message: Alert message to queue
+        """
+        if not self.enabled or not self.config:
+            return
+        
+        with self._lock:
+            if self._closed:
+                print("Discord notifier is closed; dropping alert")
+                return
+            self._pending.append(message)
+            if len(self._pending) >= self.max_batch_size:
+                # Submitted under the lock so close() can't shut the executor down in between
+                self._executor.submit(self.flush).add_done_callback(self._log_failure)
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self) -> bool:
+        """
+        Post all queued alerts now.
+        
+        Returns:
+            True if every batch was sent successfully, False otherwise
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        
+        success = True
+        for content in self._batch_contents(pending):
+            success = self._post(content) and success
+        return success
+    
+    def close(self):
+        """Post any queued alerts and wait for in-flight posts to finish."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.flush()
+        self._executor.shutdown(wait=True)
+        self._session.close()
+    
+    @staticmethod
+    def _log_failure(future: Future):
+        """Report exceptions raised by a background post."""
+        exc = future.exception()
+        if exc is not None:
+            print(f"Error sending Discord notification: {exc}")
+    
+    def _batch_contents(self, messages: List[str]) -> List[str]:
+        """Join messages into as few code blocks as fit in one Discord message each."""
+        contents = []
+        batch: List[str] = []
+        length = 0
+        # Messages too long for one post on their own are split first
+        pieces = [piece for message in messages for piece in self._split_message(message)]
+        for piece in pieces:
+            # Account for the blank line separating messages
+            if batch and length + len(piece) + 2 > self.MAX_CONTENT_LENGTH:
+                contents.append(batch)
+                batch, length = [], 0
+            batch.append(piece)
+            length += len(piece) + 2
+        if batch:
+            contents.append(batch)
+        return ["```\n" + "\n\n".join(batch) + "\n```" for batch in contents]
+    
+    def _split_message(self, message: str) -> List[str]:
+        """Split a message longer than MAX_CONTENT_LENGTH, preferring line breaks."""
+        pieces = []
+        while len(message) > self.MAX_CONTENT_LENGTH:
+            cut = message.rfind("\n", 0, self.MAX_CONTENT_LENGTH + 1)
+            if cut <= 0:
+                cut = self.MAX_CONTENT_LENGTH
+            pieces.append(message[:cut])
+            message = message[cut:].lstrip("\n")
+        pieces.append(message)
+        return pieces
+    
+    def _post(self, content: str) -> bool:
+        """Post content to the webhook."""
         try:
             payload = {
-                "content": f"```\n{message}\n```",
+                "content": content,
                 "username": "RSI Alerter"
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.config.webhook_url,
                 json=payload,
                 timeout=5
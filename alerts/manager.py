@@ -1,13 +1,26 @@
 """Alert management with cooldown and duplicate prevention."""
-from typing import Dict, Set, Optional
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
 from signals.detector import Signal, SignalType
 from config import AlertConfig
 
+# Divergences are unique events: they skip the cooldown and are de-duplicated by timestamp
+_DIVERGENCE_TYPES = frozenset({SignalType.BULLISH_DIVERGENCE, SignalType.BEARISH_DIVERGENCE})
+
 
 class AlertManager:
     """Manages alert delivery with cooldown and duplicate prevention."""
     
+    _SIGNAL_NAMES = {
+        SignalType.OVERSOLD: "🔻 OVERSOLD",
+        SignalType.OVERBOUGHT: "🔺 OVERBOUGHT",
+        SignalType.BULLISH_DIVERGENCE: "📈 BULLISH DIVERGENCE",
+        SignalType.BEARISH_DIVERGENCE: "📉 BEARISH DIVERGENCE"
+    }
+    _NUMERIC = (int, float)
+    _TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+    
     def __init__(self, config: AlertConfig):
         """
         Initialize alert manager.
@@ -16,10 +29,13 @@ class AlertManager:
             config: Alert configuration
         """
         self.config = config
-        self.last_alert_time: Dict[SignalType, Optional[datetime]] = {
-            signal_type: None for signal_type in SignalType
-        }
-        self.recent_signals: Set[str] = set()  # Track recent signals to prevent duplicates
+        # time.monotonic() of the last alert per signal type; missing means never alerted
+        self.last_alert_time: Dict[SignalType, float] = {}
+        # Recent signal keys -> time recorded, oldest first (prevents duplicates)
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        self._max_recent = 10_000
+        # Keys expire well after the cooldown; divergence keys are minute-stamped so never recur
+        self._recent_ttl = max(config.cooldown_seconds * 4, 86400)
     
     def should_send_alert(self, signal: Signal) -> bool:
         """
@@ -35,26 +51,18 @@ class AlertManager:
         if not signal.confirmed:
             return False
         
+        signal_key, is_divergence = self._signal_key(signal)
+        
         # For divergence signals, skip cooldown (they're unique events, duplicate detection is sufficient)
-        is_divergence = signal.signal_type.value in ('bullish_divergence', 'bearish_divergence')
         if not is_divergence:
             # Check cooldown for oversold/overbought signals
             last_time = self.last_alert_time.get(signal.signal_type)
-            if last_time:
-                elapsed = (datetime.now() - last_time).total_seconds()
-                if elapsed < self.config.cooldown_seconds:
-                    return False
+            if last_time is not None and time.monotonic() - last_time < self.config.cooldown_seconds:
+                return False
         
         # Check for duplicates
-        # For divergences, use timestamp to avoid duplicates (same divergence detected multiple times)
-        # For oversold/overbought, use signal type + timeframe
-        is_divergence = signal.signal_type.value in ('bullish_divergence', 'bearish_divergence')
-        if is_divergence:
-            timestamp_minute = signal.timestamp.replace(second=0, microsecond=0)
-            signal_key = f"{signal.signal_type}_{signal.timeframe}_{timestamp_minute.isoformat()}"
-        else:
-            signal_key = f"{signal.signal_type}_{signal.timeframe}"
-        if signal_key in self.recent_signals:
+        self._evict_expired()
+        if signal_key in self._recent:
             return False
         
         return True
@@ -66,19 +74,42 @@ class AlertManager:
         Args:
             signal: Signal that triggered the alert
         """
-        self.last_alert_time[signal.signal_type] = datetime.now()
-        # For divergences, use timestamp to avoid duplicates
-        is_divergence = signal.signal_type.value in ('bullish_divergence', 'bearish_divergence')
-        if is_divergence:
-            timestamp_minute = signal.timestamp.replace(second=0, microsecond=0)
-            signal_key = f"{signal.signal_type}_{signal.timeframe}_{timestamp_minute.isoformat()}"
-        else:
-            signal_key = f"{signal.signal_type}_{signal.timeframe}"
-        self.recent_signals.add(signal_key)
+        now = time.monotonic()
+        self.last_alert_time[signal.signal_type] = now
+        signal_key, _ = self._signal_key(signal)
+        self._recent[signal_key] = now
+        self._recent.move_to_end(signal_key)
+        self._evict_expired()
+    
+    def _evict_expired(self):
+        """Drop signal keys older than the TTL, and the oldest keys beyond the size cap."""
+        cutoff = time.monotonic() - self._recent_ttl
+        recent = self._recent
+        while recent:
+            oldest_recorded_at = next(iter(recent.values()))
+            if oldest_recorded_at >= cutoff and len(recent) <= self._max_recent:
+                break
+            recent.popitem(last=False)
+    
+    @staticmethod
+    def _signal_key(signal: Signal) -> Tuple[str, bool]:
+        """
+        Build the duplicate-detection key for a signal.
         
-        # Clean up old signal keys (keep only recent ones)
-        # This set will grow, but with cooldown it should be manageable
-        # In production, could implement a time-based cleanup
+        For divergences, the key includes the signal minute (the same divergence
+        is detected on multiple polls). For oversold/overbought, it is signal
+        type + timeframe.
+        
+        Args:
+            signal: Signal to key
+            
+        Returns:
+            Tuple of (signal key, whether the signal is a divergence)
+        """
+        if signal.signal_type in _DIVERGENCE_TYPES:
+            timestamp_minute = signal.timestamp.replace(second=0, microsecond=0)
+            return f"{signal.signal_type.value}_{signal.timeframe}_{timestamp_minute.isoformat(timespec='minutes')}", True
+        return f"{signal.signal_type.value}_{signal.timeframe}", False
     
     def get_alert_message(self, signal: Signal) -> str:
         """
@@ -90,16 +121,9 @@ class AlertManager:
         Returns:
             Formatted alert message
         """
-        signal_names = {
-            SignalType.OVERSOLD: "🔻 OVERSOLD",
-            SignalType.OVERBOUGHT: "🔺 OVERBOUGHT",
-            SignalType.BULLISH_DIVERGENCE: "📈 BULLISH DIVERGENCE",
-            SignalType.BEARISH_DIVERGENCE: "📉 BEARISH DIVERGENCE"
-        }
-        
-        name = signal_names.get(signal.signal_type, signal.signal_type.value.upper())
+        name = self._SIGNAL_NAMES.get(signal.signal_type, signal.signal_type.value.upper())
         timeframes_str = ", ".join([
-            f"{tf}: {rsi:.2f}" if rsi is not None and isinstance(rsi, (int, float)) else f"{tf}: N/A"
+            f"{tf}: {rsi:.2f}" if isinstance(rsi, self._NUMERIC) else f"{tf}: N/A"
             for tf, rsi in signal.timeframes_status.items()
         ])
         
@@ -108,6 +132,6 @@ class AlertManager:
             f"RSI: {signal.rsi_value:.2f} ({signal.timeframe})\n"
             f"Timeframes: {timeframes_str}\n"
             f"Confirmed: {'✅' if signal.confirmed else '❌'}\n"
-            f"Time: {signal.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
+            f"Time: {signal.timestamp.strftime(self._TIME_FORMAT)}"
         )
 
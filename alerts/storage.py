@@ -1,30 +1,92 @@
-"""Persistent storage for alerts using JSON file."""
+"""Persistent storage for alerts using an append-only JSON Lines file."""
 import json
 import os
-from typing import List, Dict
+import threading
+from collections import deque
+from typing import List, Dict, Optional
 from pathlib import Path
-from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+
+def _dumps_line(alert: Dict) -> bytes:
+    """Serialize one alert as a UTF-8 JSON line."""
+    if orjson is not None:
+        return orjson.dumps(alert) + b'\n'
+    return json.dumps(alert, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _loads(line: bytes) -> Dict:
+    """Parse one JSON line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 
 class AlertStorage:
-    """Persistent storage for alerts using JSON file."""
+    """Persistent storage for alerts using an append-only JSON Lines file."""
+    
+    # Number of most recent alerts kept on disk
+    MAX_STORED_ALERTS = 1000
+    # Extra lines allowed to accumulate before the file is rewritten
+    COMPACT_EVERY = 100
     
-    def __init__(self, storage_file: str = "alerts_history.json"):
+    def __init__(self, storage_file: str = "alerts_history.jsonl"):
         """
         Initialize alert storage.
         
         Args:
-            storage_file: Path to JSON file for storing alerts
+            storage_file: Path to JSON Lines file for storing alerts (one alert per line, oldest first)
         """
         self.storage_file = storage_file
         self.storage_path = Path(storage_file)
+        # In-memory copy of the stored alerts (most recent first), read from disk once
+        self._cache: Optional[List[Dict]] = None
+        # Number of lines currently in the file (may exceed MAX_STORED_ALERTS until compacted)
+        self._line_count = 0
+        # Saves may run on a worker thread while the API clears or reads alerts
+        self._lock = threading.Lock()
+        # Bumped by clear(); saves queued before a clear pass the old value and are dropped
+        self.generation = 0
         self._ensure_storage_dir()
+        self._migrate_legacy_file()
     
     def _ensure_storage_dir(self):
         """Ensure the storage directory exists."""
         if self.storage_path.parent != Path("."):
             self.storage_path.parent.mkdir(parents=True, exist_ok=True)
     
+    def _migrate_legacy_file(self):
+        """Convert the old JSON array file (most recent first) to JSON Lines once."""
+        legacy_path = self.storage_path.with_suffix('.json')
+        if legacy_path == self.storage_path or self.storage_path.exists() or not legacy_path.exists():
+            return
+        
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                alerts = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error reading legacy alert storage {legacy_path}: {e}")
+            return
+        if not isinstance(alerts, list):
+            alerts = []
+        
+        self._cache = alerts[:self.MAX_STORED_ALERTS]
+        self._save_all(self._cache)
+        if not self.storage_path.exists():
+            # Keep the legacy file so the migration is retried next start
+            self._cache = None
+            return
+        
+        try:
+            legacy_path.rename(legacy_path.with_name(legacy_path.name + '.migrated'))
+        except OSError as e:
+            print(f"Error renaming legacy alert storage {legacy_path}: {e}")
+        print(f"Migrated {len(self._cache)} alerts from {legacy_path} to {self.storage_path}")
+    
     def load_alerts(self, max_alerts: int = 100) -> List[Dict]:
         """
         Load alerts from storage file.
@@ -35,17 +97,40 @@ class AlertStorage:
         Returns:
             List of alert dictionaries
         """
-        if not self.storage_path.exists():
-            return []
+        with self._lock:
+            return self._load_cache()[:max_alerts]
+    
+    def _load_cache(self) -> List[Dict]:
+        """Read stored alerts from disk on first use."""
+        if self._cache is not None:
+            return self._cache
         
+        self._cache = []
+        self._line_count = 0
         try:
-            with open(self.storage_path, 'r', encoding='utf-8') as f:
-                alerts = json.load(f)
-                # Return most recent alerts, limited by max_alerts
-                return alerts[:max_alerts] if isinstance(alerts, list) else []
-        except (json.JSONDecodeError, IOError) as e:
+            # Only the newest MAX_STORED_ALERTS lines are kept while reading
+            recent = deque(maxlen=self.MAX_STORED_ALERTS)
+            with open(self.storage_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    self._line_count += 1
+                    try:
+                        recent.appendleft(_loads(line))
+                    except json.JSONDecodeError as e:
+                        # Skip a partially written line rather than losing the whole history
+                        print(f"Skipping corrupt alert record in storage: {e}")
+            self._cache = list(recent)
+        except FileNotFoundError:
+            return self._cache
+        except IOError as e:
             print(f"Error loading alerts from storage: {e}")
-            return []
+            return self._cache
+        
+        # Drop records beyond the retention limit left over from previous runs
+        if self._line_count > self.MAX_STORED_ALERTS:
+            self._compact()
+        return self._cache
     
     def save_alert(self, alert_data: Dict):
         """
@@ -54,52 +139,92 @@ class AlertStorage:
         Args:
             alert_data: Alert dictionary to save
         """
-        alerts = self.load_alerts(max_alerts=1000)  # Load more for appending
-        alerts.insert(0, alert_data)  # Insert at beginning (most recent first)
+        self.save_many([alert_data])
+    
+    def save_many(self, alerts: List[Dict], encoded: Optional[List[bytes]] = None,
+                  generation: Optional[int] = None):
+        """
+        Save several alerts to storage with a single append.
         
-        # Keep only the most recent alerts (e.g., last 1000)
-        alerts = alerts[:1000]
+        Args:
+            alerts: Alert dictionaries in the order they occurred (oldest first)
+            encoded: The same alerts already serialized as JSON (without newlines), if available
+            generation: Value of self.generation when the alerts were queued; the save is
+                skipped if storage was cleared since
+        """
+        if not alerts:
+            return
         
-        self._save_all(alerts)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            cached = self._load_cache()
+            cached[0:0] = reversed(alerts)  # Insert at beginning (most recent first)
+            
+            # Keep only the most recent alerts
+            del cached[self.MAX_STORED_ALERTS:]
+            
+            try:
+                with open(self.storage_path, 'ab') as f:
+                    if encoded is not None:
+                        f.write(b''.join(line + b'\n' for line in encoded))
+                    else:
+                        f.write(b''.join(_dumps_line(alert) for alert in alerts))
+                self._line_count += len(alerts)
+            except IOError as e:
+                print(f"Error saving alert to storage: {e}")
+                return
+            
+            if self._line_count >= self.MAX_STORED_ALERTS + self.COMPACT_EVERY:
+                self._compact()
     
     def save_all(self, alerts: List[Dict]):
         """
         Save all alerts to storage (replaces existing).
         
         Args:
-            alerts: List of alert dictionaries
+            alerts: List of alert dictionaries (most recent first)
         """
-        self._save_all(alerts)
+        with self._lock:
+            self._cache = list(alerts)
+            self._save_all(self._cache)
+    
+    def _compact(self):
+        """Rewrite the file with only the retained alerts."""
+        self._save_all(self._cache)
     
     def _save_all(self, alerts: List[Dict]):
         """Internal method to save alerts to file."""
         try:
             # Write to temporary file first, then rename (atomic operation)
             temp_file = f"{self.storage_file}.tmp"
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(alerts, f, indent=2, ensure_ascii=False)
+            with open(temp_file, 'wb') as f:
+                # Stored oldest first so new alerts can be appended
+                f.writelines(_dumps_line(alert) for alert in reversed(alerts))
             
-            # Atomic replace
-            if os.path.exists(self.storage_file):
-                os.replace(temp_file, self.storage_file)
-            else:
-                os.rename(temp_file, self.storage_file)
+            # Atomic replace (works whether or not the target exists)
+            os.replace(temp_file, self.storage_file)
+            self._line_count = len(alerts)
                 
         except IOError as e:
             print(f"Error saving alerts to storage: {e}")
-            # Clean up temp file if it exists
+            # Clean up the temp file (it may not have been created)
             temp_file = f"{self.storage_file}.tmp"
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+            try:
+                os.remove(temp_file)
+            except FileNotFoundError:
+                pass
+            except OSError as remove_error:
+                print(f"Error removing temporary alert storage file: {remove_error}")
     
     def clear(self):
         """Clear all stored alerts."""
-        if self.storage_path.exists():
+        with self._lock:
+            self.generation += 1
+            self._cache = []
+            self._line_count = 0
             try:
-                self.storage_path.unlink()
+                self.storage_path.unlink(missing_ok=True)
             except IOError as e:
                 print(f"Error clearing alert storage: {e}")
 
@@ -0,0 +1,182 @@
+"""Columnar ring buffer for chart bars."""
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from providers.base import Bar
+
+
+class BarBuffer:
+    """
+    Ring buffer storing bars as one NumPy array per field.
+    
+    Providers return the whole bar window on every poll; sync() only writes
+    bars that are new since the previous poll (plus the still-forming last bar)
+    instead of rebuilding a list of dicts each time.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize bar buffer.
+        
+        Args:
+            capacity: Initial number of bars held (grows if a larger window is synced)
+        """
+        self._lock = threading.Lock()
+        # Incremented whenever the stored bars change (lets callers cache encoded output)
+        self.version = 0
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity: int):
+        """Allocate empty column arrays."""
+        self.capacity = capacity
+        # Timestamps stay isoformat strings (bars may be naive or tz-aware)
+        self._timestamp = np.empty(capacity, dtype=object)
+        self._open = np.empty(capacity, dtype=np.float64)
+        self._high = np.empty(capacity, dtype=np.float64)
+        self._low = np.empty(capacity, dtype=np.float64)
+        self._close = np.empty(capacity, dtype=np.float64)
+        # Some providers report fractional volumes, so volume is a float column like the prices
+        self._volume = np.empty(capacity, dtype=np.float64)
+        self._start = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def sync(self, bars: List[Bar]):
+        """
+        Make the buffer hold exactly the given bar window.
+        
+        Args:
+            bars: Current bars for the timeframe (oldest first)
+        """
+        with self._lock:
+            changed = self._sync_incremental(bars)
+            if changed is None:
+                # An empty window synced into an empty buffer changes nothing
+                changed = bool(bars) or self._size > 0
+                self._reload(bars)
+            if changed:
+                self.version += 1
+    
+    def _sync_incremental(self, bars: List[Bar]) -> Optional[bool]:
+        """
+        Append bars after the last stored one.
+        
+        Args:
+            bars: Current bars for the timeframe (oldest first)
+            
+        Returns:
+            Whether the stored bars changed, or None if the windows don't line up
+        """
+        if self._size == 0 or not bars or len(bars) > self.capacity:
+            return None
+        
+        last_timestamp = self._timestamp[self._slot(self._size - 1)]
+        overlap = None
+        for i in range(len(bars) - 1, -1, -1):
+            if bars[i].timestamp.isoformat() == last_timestamp:
+                overlap = i
+                break
+        if overlap is None:
+            return None
+        
+        # Drop the oldest bars so the stored window starts where the new one does
+        drop = self._size - 1 - overlap
+        if drop < 0 or not self._overlap_matches(drop, bars[:overlap]):
+            return None
+        self._start = self._slot(drop)
+        self._size -= drop
+        
+        # The last stored bar may still have been forming; overwrite it, then append
+        changed = drop > 0 or overlap + 1 < len(bars) or not self._matches(self._size - 1, bars[overlap])
+        self._write(self._size - 1, bars[overlap])
+        for bar in bars[overlap + 1:]:
+            self._write(self._size, bar)
+            self._size += 1
+        return changed
+    
+    def _overlap_matches(self, drop: int, bars: List[Bar]) -> bool:
+        """
+        Whether the stored bars from index drop on equal the given bars.
+        
+        Catches gaps, backfilled bars and revised values anywhere in the window,
+        not just at its ends. The last stored bar is left out (it may still be forming).
+        
+        Args:
+            drop: Logical index of the stored bar matching bars[0]
+            bars: New bars up to, but not including, the last stored one
+        """
+        count = len(bars)
+        if count == 0:
+            return True
+        stored = {name: self._take(column, drop, count) for name, column in (
+            ("timestamp", self._timestamp), ("open", self._open), ("high", self._high),
+            ("low", self._low), ("close", self._close), ("volume", self._volume)
+        )}
+        if stored["timestamp"].tolist() != [bar.timestamp.isoformat() for bar in bars]:
+            return False
+        return all(
+            np.array_equal(stored[name], np.fromiter((getattr(bar, name) for bar in bars), dtype=np.float64, count=count))
+            for name in ("open", "high", "low", "close", "volume")
+        )
+    
+    def _reload(self, bars: List[Bar]):
+        """Replace the whole buffer with the given bars."""
+        if len(bars) > self.capacity:
+            self._allocate(max(len(bars), self.capacity * 2))
+        self._start = 0
+        self._size = len(bars)
+        for i, bar in enumerate(bars):
+            self._write(i, bar)
+    
+    def _slot(self, index: int) -> int:
+        """Array position of the index-th stored bar."""
+        return (self._start + index) % self.capacity
+    
+    def _matches(self, index: int, bar: Bar) -> bool:
+        """Whether the stored bar at the given logical index has the same OHLCV values."""
+        slot = self._slot(index)
+        return (
+            self._open[slot] == bar.open and self._high[slot] == bar.high and
+            self._low[slot] == bar.low and self._close[slot] == bar.close and
+            self._volume[slot] == bar.volume
+        )
+    
+    def _write(self, index: int, bar: Bar):
+        """Store a bar at the given logical index."""
+        slot = self._slot(index)
+        self._timestamp[slot] = bar.timestamp.isoformat()
+        self._open[slot] = bar.open
+        self._high[slot] = bar.high
+        self._low[slot] = bar.low
+        self._close[slot] = bar.close
+        self._volume[slot] = bar.volume
+    
+    def columns(self) -> Dict[str, object]:
+        """
+        Get the stored bars as contiguous columns (oldest first).
+        
+        Returns:
+            Dict with a list of isoformat timestamps and a NumPy array per OHLCV field
+        """
+        with self._lock:
+            return {
+                "timestamp": self._take(self._timestamp).tolist(),
+                "open": self._take(self._open),
+                "high": self._take(self._high),
+                "low": self._take(self._low),
+                "close": self._take(self._close),
+                "volume": self._take(self._volume)
+            }
+    
+    def _take(self, column: np.ndarray, index: int = 0, count: Optional[int] = None) -> np.ndarray:
+        """Copy count stored bars of a column from a logical index on (all by default), in order."""
+        if count is None:
+            count = self._size - index
+        start = self._slot(index)
+        end = start + count
+        if end <= self.capacity:
+            return column[start:end].copy()
+        # Stored region wraps around the end of the array
+        return np.concatenate((column[start:], column[:end - self.capacity]))
@@ -0,0 +1,89 @@
+"""Downsampling of chart data to roughly one point per pixel column."""
+from typing import Dict, List
+import numpy as np
+
+
+def bucket_of(index: int, count: int, buckets: int) -> int:
+    """
+    Get the bucket a bar position falls into when splitting count bars into equal buckets.
+    
+    Args:
+        index: Bar position (0-based)
+        count: Total number of bars
+        buckets: Number of buckets
+    
+    Returns:
+        Bucket number (0-based)
+    """
+    return index * buckets // count
+
+
+def aggregate_candles(columns: Dict[str, object], buckets: int) -> Dict[str, object]:
+    """
+    Merge consecutive bars into buckets, one candle per bucket (M4-style).
+    
+    Each candle keeps the bucket's first open, max high, min low and last close,
+    so the price envelope drawn on screen is unchanged.
+    
+    Args:
+        columns: Bar columns as returned by BarBuffer.columns() (more bars than buckets)
+        buckets: Number of candles to produce
+    
+    Returns:
+        Columns in the same format with one entry per bucket
+    """
+    count = len(columns["timestamp"])
+    # First bar of each bucket: the smallest index with bucket_of(index) == bucket
+    starts = (np.arange(buckets) * count + buckets - 1) // buckets
+    ends = np.append(starts[1:], count)
+    return {
+        "timestamp": [columns["timestamp"][i] for i in starts],
+        "open": columns["open"][starts],
+        "high": np.fmax.reduceat(columns["high"], starts),
+        "low": np.fmin.reduceat(columns["low"], starts),
+        "close": columns["close"][ends - 1],
+        "volume": np.add.reduceat(columns["volume"], starts)
+    }
+
+
+def downsample_rsi(points: List[Dict], count: int, buckets: int) -> List[Dict]:
+    """
+    Pick one RSI point per candle bucket using Largest-Triangle-Three-Buckets.
+    
+    Buckets line up with aggregate_candles(), and each chosen point's index is
+    replaced by its bucket number so it stays aligned with the merged candles.
+    
+    Args:
+        points: RSI points ({"timestamp", "rsi", "index"}) sorted by index
+        count: Number of bars the indices refer to
+        buckets: Number of candle buckets
+    
+    Returns:
+        Downsampled RSI points
+    """
+    points = [p for p in points if p.get("rsi") is not None and 0 <= p["index"] < count]
+    if not points:
+        return []
+    
+    x = np.fromiter((p["index"] for p in points), dtype=np.float64, count=len(points))
+    y = np.fromiter((p["rsi"] for p in points), dtype=np.float64, count=len(points))
+    # Split point positions at bucket boundaries (points are sorted by index)
+    boundaries = np.searchsorted(x, np.arange(1, buckets) * count / buckets, side="left")
+    groups = [group for group in np.split(np.arange(len(points)), boundaries) if len(group)]
+    
+    # First and last points are always kept; each bucket in between keeps the point forming
+    # the largest triangle with the previous pick and the next bucket's average
+    chosen = [groups[0][0]]
+    for i in range(1, len(groups) - 1):
+        group, next_group = groups[i], groups[i + 1]
+        ax, ay = x[chosen[-1]], y[chosen[-1]]
+        cx, cy = x[next_group].mean(), y[next_group].mean()
+        areas = np.abs((ax - cx) * (y[group] - ay) - (ax - x[group]) * (cy - ay))
+        chosen.append(group[int(np.argmax(areas))])
+    if len(groups) > 1:
+        chosen.append(groups[-1][-1])
+    
+    return [
+        {**points[i], "index": bucket_of(points[i]["index"], count, buckets)}
+        for i in chosen
+    ]
@@ -3,6 +3,7 @@ from typing import Optional, List, Dict
 from datetime import datetime
 import json
 import os
+import time
 from pathlib import Path
 
 
@@ -27,19 +28,27 @@ class RuntimeConfig:
         self.show_rsi_ma: bool = persisted_config.get("show_rsi_ma", False)
         self.show_divergence: bool = persisted_config.get("show_divergence", False)
         
+        # Bumped on every setting change; starts from the clock so it never repeats across restarts
+        self.version: int = time.time_ns() // 1_000_000
+        # Encoded get_config() output, rebuilt after a change
+        self._config_json: Optional[bytes] = None
+        
         self.rsi_history_1min: List[Dict] = []
         self.rsi_history_5min: List[Dict] = []
         self.rsi_history_30min: List[Dict] = []
         self.max_rsi_history = 2000
+        # Bumped whenever any RSI history changes (lets the API cache its encoded response)
+        self.rsi_version = 0
+        # Per-timeframe counterpart of rsi_version: {timeframe: changes so far}
+        self.rsi_versions: Dict[str, int] = {}
     
     def _load_config(self) -> Dict:
         """Load persisted configuration from file."""
-        if not self.config_path.exists():
-            return {}
-        
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
+        except FileNotFoundError:
+            return {}
         except (json.JSONDecodeError, IOError) as e:
             print(f"Error loading runtime config: {e}")
             return {}
@@ -47,60 +56,55 @@ class RuntimeConfig:
     def _save_config(self):
         """Save configuration to file."""
         try:
-            config = {
-                "bypass_market_hours": self.bypass_market_hours,
-                "use_mock_data": self.use_mock_data,
-                "polling_interval_seconds": self.polling_interval_seconds,
-                "historical_bars_count": self.historical_bars_count,
-                "rsi_ma_type": self.rsi_ma_type,
-                "rsi_ma_length": self.rsi_ma_length,
-                "show_rsi_ma": self.show_rsi_ma,
-                "show_divergence": self.show_divergence
-            }
+            config = self.get_config()
             
             # Write to temporary file first, then rename (atomic operation)
             temp_file = f"{self.config_file}.tmp"
             with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2, ensure_ascii=False)
             
-            # Atomic replace
-            if os.path.exists(self.config_file):
-                os.replace(temp_file, self.config_file)
-            else:
-                os.rename(temp_file, self.config_file)
+            # Atomic replace (works whether or not the target exists)
+            os.replace(temp_file, self.config_file)
         except IOError as e:
             print(f"Error saving runtime config: {e}")
-            # Clean up temp file if it exists
+            # Clean up the temp file (it may not have been created)
             temp_file = f"{self.config_file}.tmp"
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+            try:
+                os.remove(temp_file)
+            except FileNotFoundError:
+                pass
+            except OSError as remove_error:
+                print(f"Error removing temporary runtime config file: {remove_error}")
+    
+    def _config_changed(self):
+        """Invalidate the cached config, bump the version and persist."""
+        self.version += 1
+        self._config_json = None
+        self._save_config()
     
     def set_bypass_market_hours(self, value: bool):
         """Set bypass market hours flag."""
         self.bypass_market_hours = value
-        self._save_config()
+        self._config_changed()
     
     def set_use_mock_data(self, value: bool):
         """Set use mock data flag."""
         self.use_mock_data = value
-        self._save_config()
+        self._config_changed()
     
     def set_polling_interval(self, value: int):
         """Set polling interval in seconds."""
         if value < 1:
             raise ValueError("Polling interval must be at least 1 second")
         self.polling_interval_seconds = value
-        self._save_config()
+        self._config_changed()
     
     def set_historical_bars_count(self, value: int):
         """Set historical bars count."""
         if value < 1:
             raise ValueError("Historical bars count must be at least 1")
         self.historical_bars_count = value
-        self._save_config()
+        self._config_changed()
     
     def get_polling_interval(self, default: int) -> int:
         """Get polling interval, using default if not set."""
@@ -109,6 +113,29 @@ class RuntimeConfig:
     def clear_rsi_history(self, timeframe: str):
         """Clear RSI history for a timeframe."""
         setattr(self, f'rsi_history_{timeframe}', [])
+        self._rsi_history_changed(timeframe)
+    
+    def set_rsi_history(self, timeframe: str, bars: List, rsi_values: List[Optional[float]]):
+        """
+        Replace the RSI history for a timeframe in one pass.
+        
+        Args:
+            timeframe: Timeframe the values belong to
+            bars: Bars the RSI was calculated from (oldest first)
+            rsi_values: RSI per bar, None where there is not enough data
+        """
+        # Missing values only lead the series, so the newest max_rsi_history bars hold the kept points
+        count = min(len(bars), len(rsi_values))
+        history = [
+            {"timestamp": bars[i].timestamp.isoformat(), "rsi": rsi_values[i], "index": i}
+            for i in range(max(count - self.max_rsi_history, 0), count)
+            if rsi_values[i] is not None
+        ]
+        # Polls with no new data rebuild the same history; keep the versions (and API caches) as they are
+        if history == getattr(self, f'rsi_history_{timeframe}', None):
+            return
+        setattr(self, f'rsi_history_{timeframe}', history)
+        self._rsi_history_changed(timeframe)
     
     def add_rsi_point(self, timeframe: str, timestamp: datetime, rsi_value: float, index: int):
         """Add RSI data point for a timeframe."""
@@ -129,28 +156,34 @@ class RuntimeConfig:
         if len(history) > self.max_rsi_history:
             history = history[-self.max_rsi_history:]
         setattr(self, f'rsi_history_{timeframe}', history)
+        self._rsi_history_changed(timeframe)
+    
+    def _rsi_history_changed(self, timeframe: str):
+        """Bump the RSI history versions after a timeframe's history changed."""
+        self.rsi_version += 1
+        self.rsi_versions[timeframe] = self.rsi_versions.get(timeframe, 0) + 1
     
     def set_rsi_ma_type(self, value: str):
         """Set RSI MA type."""
         self.rsi_ma_type = value
-        self._save_config()
+        self._config_changed()
     
     def set_rsi_ma_length(self, value: int):
         """Set RSI MA length."""
         if value < 1:
             raise ValueError("RSI MA length must be at least 1")
         self.rsi_ma_length = value
-        self._save_config()
+        self._config_changed()
     
     def set_show_rsi_ma(self, value: bool):
         """Set show RSI MA flag."""
         self.show_rsi_ma = value
-        self._save_config()
+        self._config_changed()
     
     def set_show_divergence(self, value: bool):
         """Set show divergence flag."""
         self.show_divergence = value
-        self._save_config()
+        self._config_changed()
     
     def get_config(self) -> dict:
         """Get current runtime configuration."""
@@ -164,6 +197,12 @@ class RuntimeConfig:
             "show_rsi_ma": self.show_rsi_ma,
             "show_divergence": self.show_divergence
         }
+    
+    def get_config_json(self) -> bytes:
+        """Get current runtime configuration encoded as JSON (cached until a setting changes)."""
+        if self._config_json is None:
+            self._config_json = json.dumps(self.get_config()).encode('utf-8')
+        return self._config_json
 
 
 # Global runtime config instance
@@ -0,0 +1,1861 @@
+const statusDiv = document.getElementById('status');
+const alertsDiv = document.getElementById('alerts');
+
+// Setup WebSocket connection
+let ws = null;
+// Newest alert id received and the server epoch it belongs to, so a reconnect only replays newer alerts
+let lastAlertId = 0;
+let alertEpoch = null;
+function connectWebSocket() {
+    try {
+        // Auto-detect WebSocket protocol (ws:// for HTTP, wss:// for HTTPS)
+        const wsProtocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        // Ask for MessagePack binary frames if the decoder loaded (server falls back to JSON)
+        const subprotocols = window.MessagePack ? ['msgpack'] : [];
+        const since = alertEpoch === null ? '' : `?since=${lastAlertId}&epoch=${alertEpoch}`;
+        ws = new WebSocket(`${wsProtocol}//${window.location.host}/ws${since}`, subprotocols);
+        ws.binaryType = 'arraybuffer';
+
+ws.onopen = () => {
+    statusDiv.textContent = '[OK] Connected - Listening for alerts...';
+    statusDiv.className = 'status connected';
+    // Bar updates may have been missed while disconnected
+    if (marketChart) {
+        loadCandlestickChart();
+    }
+};
+
+ws.onclose = () => {
+    statusDiv.textContent = '[X] Disconnected - Reconnecting...';
+    statusDiv.className = 'status disconnected';
+            // Reconnect after 3 seconds
+            setTimeout(connectWebSocket, 3000);
+        };
+
+        ws.onerror = (error) => {
+        console.error('WebSocket error:', error);
+        statusDiv.textContent = '[X] Connection Error';
+        statusDiv.className = 'status disconnected';
+};
+
+ws.onmessage = (event) => {
+            try {
+    const msg = typeof event.data === 'string'
+        ? JSON.parse(event.data)
+        : MessagePack.decode(new Uint8Array(event.data));
+    handleMessage(msg);
+            } catch (e) {
+                console.error('Error parsing alert:', e);
+            }
+        };
+    } catch (error) {
+        console.error('Error creating WebSocket:', error);
+        statusDiv.textContent = '[X] Connection Error';
+        statusDiv.className = 'status disconnected';
+    }
+}
+
+// Connect WebSocket
+connectWebSocket();
+
+// Candlestick chart setup
+const chartCtx = document.getElementById('marketChart').getContext('2d');
+const rsiChartCtx = document.getElementById('rsiChart').getContext('2d');
+let marketChart = null;
+let rsiChart = null;
+let allCandlestickData = [];
+let selectedTimeframe = '1min'; // Default timeframe
+let previousTimeframe = '1min'; // Track previous timeframe to detect changes
+let availableTimeframes = ['1min', '5min', '30min']; // Will be loaded from API
+let chartVersion = null; // Version of the last chart snapshot received (server answers 304 if unchanged)
+let liveChartVersion = null; // Version after the last snapshot or bar delta applied on top of it
+let chartBuckets = 0; // Candle buckets the last snapshot was downsampled to (0 for single bars)
+let chartResyncing = false; // A reload triggered by a missed bar delta is in flight
+let rsiHistory = null; // RSI history from the last chart snapshot
+let rsiHistoryRequest = null; // Pending /api/rsi-history request when there is no snapshot yet
+// Chart points built from an RSI history array, reused while bar deltas only append to it
+let rsiPointsCache = { source: null, sourceCount: 0, stableCount: 0, points: [] };
+let lastConfigJSON = null; // Last config applied to the controls
+
+// Controls read by the RSI chart plugins on every draw, looked up once
+const oversoldLevelInput = document.getElementById('oversoldLevel');
+const overboughtLevelInput = document.getElementById('overboughtLevel');
+const divergenceToggleInput = document.getElementById('divergenceToggle');
+// RSI level lines, parsed when the inputs change rather than on every draw
+const rsiLevels = { oversold: 30, overbought: 70 };
+function readRSILevels() {
+    rsiLevels.oversold = oversoldLevelInput ? parseFloat(oversoldLevelInput.value) || 30 : 30;
+    rsiLevels.overbought = overboughtLevelInput ? parseFloat(overboughtLevelInput.value) || 70 : 70;
+}
+readRSILevels();
+oversoldLevelInput?.addEventListener('input', readRSILevels);
+overboughtLevelInput?.addEventListener('input', readRSILevels);
+
+// Margin for chart display (empty bars on each side)
+const CHART_MARGIN_BARS = 3;
+
+// Formatters built once (toLocale*String sets up a new formatter on every call)
+const TICK_TIME_FORMAT = new Intl.DateTimeFormat('en-US', { hour: '2-digit', minute: '2-digit' });
+const DATE_TIME_FORMAT = new Intl.DateTimeFormat(undefined, {
+    year: 'numeric', month: 'numeric', day: 'numeric', hour: 'numeric', minute: 'numeric', second: 'numeric'
+});
+
+// Axis label of a candle, formatted once and kept on the candle (unchanged candles are reused across updates)
+function candleTickLabel(candle) {
+    if (candle.tick === undefined) {
+        candle.tick = TICK_TIME_FORMAT.format(candle.t);
+    }
+    return candle.tick;
+}
+
+// Helper function to add margin to x-axis range
+function addChartMargin(min, max, dataLength) {
+    // Add margin of 3 bars on each side
+    // Allow negative values (empty space on left) and values beyond dataLength (empty space on right)
+    const paddedMin = min - CHART_MARGIN_BARS;
+    const paddedMax = max + CHART_MARGIN_BARS;
+    return { min: paddedMin, max: paddedMax };
+}
+
+// MA calculation functions
+function calculateSMA(values, period) {
+    if (values.length < period) return [];
+    const result = [];
+    // Sliding window sum: add the value entering the window, drop the one leaving it
+    let sum = 0;
+    for (let i = 0; i < period; i++) {
+        sum += values[i];
+    }
+    result.push(sum / period);
+    for (let i = period; i < values.length; i++) {
+        sum += values[i] - values[i - period];
+        result.push(sum / period);
+    }
+    return result;
+}
+
+function calculateEMA(values, period) {
+    if (values.length < period) return [];
+    const result = [];
+    const multiplier = 2 / (period + 1);
+    // Start with SMA for first value
+    let sum = 0;
+    for (let i = 0; i < period; i++) {
+        sum += values[i];
+    }
+    result.push(sum / period);
+    // Calculate EMA for remaining values
+    for (let i = period; i < values.length; i++) {
+        const ema = (values[i] - result[result.length - 1]) * multiplier + result[result.length - 1];
+        result.push(ema);
+    }
+    return result;
+}
+
+function calculateRMA(values, period) {
+    if (values.length < period) return [];
+    const result = [];
+    // Start with SMA for first value
+    let sum = 0;
+    for (let i = 0; i < period; i++) {
+        sum += values[i];
+    }
+    result.push(sum / period);
+    // Calculate RMA (Wilder's smoothing) for remaining values
+    for (let i = period; i < values.length; i++) {
+        const rma = (values[i] + result[result.length - 1] * (period - 1)) / period;
+        result.push(rma);
+    }
+    return result;
+}
+
+function calculateWMA(values, period) {
+    if (values.length < period) return [];
+    const result = [];
+    const weightSum = period * (period + 1) / 2;
+    // Weighted sum (newest value weighted by period) and plain sum of the current window
+    let weighted = 0;
+    let sum = 0;
+    for (let j = 0; j < period; j++) {
+        weighted += values[j] * (j + 1);
+        sum += values[j];
+    }
+    result.push(weighted / weightSum);
+    for (let i = period; i < values.length; i++) {
+        // Sliding one step lowers every weight by one (the oldest value drops out) and adds the new value
+        weighted += period * values[i] - sum;
+        sum += values[i] - values[i - period];
+        result.push(weighted / weightSum);
+    }
+    return result;
+}
+
+function calculateMA(rsiDataPoints, maType, maLength) {
+    if (maType === 'None' || !rsiDataPoints || rsiDataPoints.length === 0) return null;
+    if (rsiDataPoints.length < maLength) return null;
+
+    const values = rsiDataPoints.map(d => d.y);
+    let maValues = [];
+
+    switch (maType) {
+        case 'SMA':
+            maValues = calculateSMA(values, maLength);
+            break;
+        case 'EMA':
+            maValues = calculateEMA(values, maLength);
+            break;
+        case 'RMA':
+            maValues = calculateRMA(values, maLength);
+            break;
+        case 'WMA':
+            maValues = calculateWMA(values, maLength);
+            break;
+        default:
+            return null;
+    }
+
+    // Map MA values back to data points (align with RSI data, offset by period)
+    const maData = [];
+    for (let i = 0; i < maValues.length; i++) {
+        const rsiIndex = i + maLength - 1; // Offset to align with RSI data
+        if (rsiIndex < rsiDataPoints.length) {
+            maData.push({
+                x: rsiDataPoints[rsiIndex].x,
+                y: maValues[i],
+                t: rsiDataPoints[rsiIndex].t
+            });
+        }
+    }
+
+    return maData.length > 0 ? maData : null;
+}
+
+
+// Columns of RSI points for divergence detection: RSI index and value, and the candle high and low
+// at each point (NaN where there is no candle), as typed arrays instead of per-point objects
+function divergenceColumns(rsiData, priceData) {
+    const n = rsiData.length;
+    const columns = {
+        x: new Int32Array(n),
+        rsi: new Float64Array(n),
+        high: new Float64Array(n),
+        low: new Float64Array(n)
+    };
+    for (let i = 0; i < n; i++) {
+        const point = rsiData[i];
+        const candle = priceData[point.x];
+        columns.x[i] = point.x;
+        columns.rsi[i] = point.y;
+        columns.high[i] = candle ? candle.h : NaN;
+        columns.low[i] = candle ? candle.l : NaN;
+    }
+    return columns;
+}
+
+// Minimum of every run of `width` consecutive values (result[k] covers values[k..k+width-1]),
+// in one pass with a monotonic deque of indices
+function windowMinima(values, width) {
+    const n = values.length;
+    const minima = new Float64Array(Math.max(n - width + 1, 0));
+    const deque = new Int32Array(n);
+    let head = 0;
+    let tail = 0;
+    for (let k = 0; k < n; k++) {
+        // Indices whose value is no lower than the new one can never be a window minimum again
+        while (tail > head && values[deque[tail - 1]] >= values[k]) tail--;
+        deque[tail++] = k;
+        if (deque[head] <= k - width) head++;
+        if (k >= width - 1) minima[k - width + 1] = values[deque[head]];
+    }
+    return minima;
+}
+
+// Flags of pivot lows: values strictly lower than every value within `width` points on either side
+function pivotLowFlags(values, width) {
+    const n = values.length;
+    const flags = new Uint8Array(n);
+    const minima = windowMinima(values, width);
+    for (let i = width; i < n - width; i++) {
+        flags[i] = minima[i - width] > values[i] && minima[i + 1] > values[i] ? 1 : 0;
+    }
+    return flags;
+}
+
+// Divergence detection function (based on Pine Script logic)
+function detectDivergence(rsiData, priceData) {
+    if (!rsiData || !priceData || rsiData.length < 20 || priceData.length < 20) return [];
+
+    const { x, rsi, high, low } = divergenceColumns(rsiData, priceData);
+    const pivotWindow = 5;
+    // A previous pivot must be at least this many points before the current one
+    const minPivotGap = pivotWindow + 5;
+    const divergences = [];
+
+    // Compare each pivot (with a candle) against the latest earlier pivot (with a candle)
+    function collect(type, isPivot, price, isDivergence) {
+        let prevIdx = -1;
+        for (let i = pivotWindow; i < rsi.length - pivotWindow; i++) {
+            const candidate = i - minPivotGap;
+            if (candidate >= pivotWindow && isPivot[candidate] && !isNaN(price[candidate])) {
+                prevIdx = candidate;
+            }
+            if (isPivot[i] && !isNaN(price[i]) && prevIdx >= 0 && isDivergence(i, prevIdx)) {
+                divergences.push({
+                    type: type,
+                    index: x[i],
+                    rsiValue: rsi[i]
+                });
+            }
+        }
+    }
+
+    // Bullish divergence: RSI higher low, price lower low (uses lows for pivot lows)
+    collect('bullish', pivotLowFlags(rsi, pivotWindow), low,
+        (i, prev) => rsi[i] > rsi[prev] && low[i] < low[prev]);
+    // Bearish divergence: RSI lower high, price higher high (uses highs for pivot highs)
+    collect('bearish', pivotLowFlags(rsi.map(v => -v), pivotWindow), high,
+        (i, prev) => rsi[i] < rsi[prev] && high[i] > high[prev]);
+
+    return divergences;
+}
+
+// Last divergence result, reused while reloads bring the same RSI points and candles
+let divergenceCache = { key: null, value: null };
+
+// Divergences for RSI points, recomputed only when the points or candles they depend on changed
+function cachedDivergences(rsiData, priceData) {
+    const first = rsiData[0];
+    const last = rsiData[rsiData.length - 1];
+    const lastCandle = priceData[priceData.length - 1];
+    // Ends of both series: appended bars, the forming bar and a shifted window all change one of them
+    const key = [
+        rsiData.length, first.x, first.y, first.t, last.x, last.y,
+        priceData.length, lastCandle && lastCandle.t, lastCandle && lastCandle.h, lastCandle && lastCandle.l
+    ].join(':');
+    if (key !== divergenceCache.key) {
+        divergenceCache = { key: key, value: detectDivergence(rsiData, priceData) };
+    }
+    return divergenceCache.value;
+}
+
+// RSI chart plugins, registered globally by ensureRSIPluginRegistered()
+// Draws the oversold, overbought and mid levels
+const rsiLevelsPlugin = {
+    id: 'rsiLevels',
+    afterDraw: (chart) => {
+        try {
+            const ctx = chart.ctx;
+            if (!chart.scales || !chart.scales.y || !chart.chartArea) return;
+            const yScale = chart.scales.y;
+
+            const { oversold, overbought } = rsiLevels;
+            const { left, right, top, bottom } = chart.chartArea;
+            const isVisible = y => !isNaN(y) && y >= top && y <= bottom;
+            const oversoldY = yScale.getPixelForValue(oversold);
+            const overboughtY = yScale.getPixelForValue(overbought);
+            const midY = yScale.getPixelForValue(50);
+
+            ctx.save();
+
+            // Oversold and overbought lines share one dashed white path
+            ctx.strokeStyle = '#FFFFFF';
+            ctx.lineWidth = 1.5;
+            ctx.setLineDash([5, 5]);
+            ctx.beginPath();
+            if (isVisible(oversoldY)) {
+                ctx.moveTo(left, oversoldY);
+                ctx.lineTo(right, oversoldY);
+            }
+            if (isVisible(overboughtY)) {
+                ctx.moveTo(left, overboughtY);
+                ctx.lineTo(right, overboughtY);
+            }
+            ctx.stroke();
+
+            // Draw midline
+            if (isVisible(midY)) {
+                ctx.strokeStyle = '#666';
+                ctx.lineWidth = 1;
+                ctx.setLineDash([3, 3]);
+                ctx.beginPath();
+                ctx.moveTo(left, midY);
+                ctx.lineTo(right, midY);
+                ctx.stroke();
+            }
+
+            // Level labels
+            ctx.fillStyle = '#FFFFFF';
+            ctx.font = 'bold 10px Arial';
+            ctx.textAlign = 'right';
+            if (isVisible(oversoldY)) {
+                ctx.fillText('Oversold ' + oversold, right - 5, oversoldY - 5);
+            }
+            if (isVisible(overboughtY)) {
+                ctx.fillText('Overbought ' + overbought, right - 5, overboughtY - 5);
+            }
+
+            ctx.restore();
+        } catch (e) {
+            console.error('Error drawing RSI levels:', e);
+        }
+    }
+};
+
+// Draws divergence markers for the selected timeframe's RSI
+const divergencePlugin = {
+    id: 'rsiDivergence',
+    afterDatasetsDraw: (chart) => {
+        try {
+            if (!divergenceToggleInput || !divergenceToggleInput.checked) return;
+
+            const ctx = chart.ctx;
+            if (!chart.scales || !chart.scales.x || !chart.scales.y || !chart.chartArea) return;
+
+            // Get RSI dataset for selected timeframe (not MA)
+            const rsiDataset = chart.data.datasets.find(d => !d.isMA && d.timeframe === selectedTimeframe);
+            const rsiData = rsiDataset && (rsiDataset.fullData || rsiDataset.data);
+            if (!rsiData || rsiData.length < 20) return;
+
+            // Calculate divergence once per data load (loadRSIChart resets it); pan, zoom
+            // and tooltip redraws reuse the markers
+            if (!rsiDataset.divergences) {
+                rsiDataset.divergences = cachedDivergences(rsiData, allCandlestickData);
+            }
+            const divergences = rsiDataset.divergences;
+
+            // Visible marker positions by type
+            const { left, right, top, bottom } = chart.chartArea;
+            const markers = { bullish: [], bearish: [] };
+            for (const div of divergences) {
+                const xPos = chart.scales.x.getPixelForValue(div.index);
+                const yPos = chart.scales.y.getPixelForValue(div.rsiValue);
+                if (xPos >= left && xPos <= right && yPos >= top && yPos <= bottom) {
+                    markers[div.type].push(xPos, yPos);
+                }
+            }
+
+            // Draw divergence markers: one path and one label pass per type
+            ctx.save();
+            ctx.font = 'bold 10px Arial';
+            ctx.textAlign = 'center';
+            for (const type in markers) {
+                const positions = markers[type];
+                if (positions.length === 0) continue;
+                const bullish = type === 'bullish';
+                ctx.fillStyle = bullish ? '#00FF00' : '#FF0000';
+                ctx.beginPath();
+                for (let i = 0; i < positions.length; i += 2) {
+                    ctx.moveTo(positions[i] + 4, positions[i + 1]);
+                    ctx.arc(positions[i], positions[i + 1], 4, 0, Math.PI * 2);
+                }
+                ctx.fill();
+
+                const label = bullish ? 'Bull' : 'Bear';
+                const labelOffset = bullish ? -12 : 12;
+                for (let i = 0; i < positions.length; i += 2) {
+                    ctx.fillText(label, positions[i], positions[i + 1] + labelOffset);
+                }
+            }
+            ctx.restore();
+        } catch (e) {
+            console.error('Error drawing divergence:', e);
+        }
+    }
+};
+
+let rsiPluginsRegistered = false;
+
+// Helper function to ensure RSI plugins are registered
+function ensureRSIPluginRegistered() {
+    if (rsiPluginsRegistered) {
+        return true;
+    }
+    if (typeof Chart === 'undefined' || !Chart.registry) {
+        return false;
+    }
+    Chart.register(rsiLevelsPlugin, divergencePlugin);
+    rsiPluginsRegistered = true;
+    return true;
+}
+
+// Candle colors (fill and outline) by direction
+const CANDLE_COLORS = {
+    up: { fill: 'rgba(75, 192, 192, 0.5)', border: 'rgb(75, 192, 192)' },
+    down: { fill: 'rgba(255, 99, 132, 0.5)', border: 'rgb(255, 99, 132)' },
+    unchanged: { fill: 'rgba(201, 203, 207, 0.5)', border: 'rgb(201, 203, 207)' }
+};
+
+// Helper function to register the batched candlestick controller (after chartjs-chart-financial)
+function ensureCandlestickControllerRegistered() {
+    if (typeof Chart === 'undefined' || !Chart.registry) {
+        return false;
+    }
+
+    // Chart.registry.getController throws if not found
+    try {
+        Chart.registry.getController('batchedCandlestick');
+        return true;
+    } catch (e) {
+        // Controller not registered yet
+    }
+
+    // Draws all candles of one direction as a single path instead of ~10 canvas calls per candle
+    const CandlestickController = Chart.registry.getController('candlestick');
+    // Only candles inside the visible x range (x is the candle index) are positioned and drawn
+    class BatchedCandlestickController extends CandlestickController {
+        update(mode) {
+            const meta = this._cachedMeta;
+            const elements = meta.data;
+            const { min, max } = meta.iScale;
+            const start = Number.isFinite(min) ? Math.max(0, Math.min(elements.length, Math.floor(min))) : 0;
+            const end = Number.isFinite(max) ? Math.max(start, Math.min(elements.length, Math.ceil(max) + 1)) : elements.length;
+
+            // Candles that scrolled out keep stale pixel positions; move them out of tooltip hit testing
+            const previousEnd = Math.min(this._visibleEnd || 0, elements.length);
+            for (let i = this._visibleStart || 0; i < previousEnd; i++) {
+                if (i < start || i >= end) {
+                    elements[i].x = NaN;
+                }
+            }
+
+            this._visibleStart = start;
+            this._visibleEnd = end;
+            this.updateElements(elements, start, end - start, mode);
+        }
+
+        draw() {
+            const chart = this.chart;
+            const ctx = chart.ctx;
+            const area = chart.chartArea;
+            const elements = this._cachedMeta.data;
+            const groups = { up: [], down: [], unchanged: [] };
+            for (let i = this._visibleStart || 0; i < Math.min(this._visibleEnd || 0, elements.length); i++) {
+                const element = elements[i];
+                // Pixel y grows downward, so a rising candle has its close above its open
+                const direction = element.close < element.open ? 'up' : (element.close > element.open ? 'down' : 'unchanged');
+                groups[direction].push(element);
+            }
+
+            ctx.save();
+            ctx.beginPath();
+            ctx.rect(area.left, area.top, area.right - area.left, area.bottom - area.top);
+            ctx.clip();
+            ctx.lineWidth = this.getDataset().borderWidth || 1;
+            for (const direction in groups) {
+                const group = groups[direction];
+                if (group.length === 0) continue;
+                // Bodies and wicks share one path: the fill only covers the bodies, the stroke draws both
+                ctx.beginPath();
+                for (const { x, open, high, low, close, width } of group) {
+                    const top = Math.min(open, close);
+                    const bottom = Math.max(open, close);
+                    ctx.rect(x - width / 2, top, width, bottom - top);
+                    ctx.moveTo(x, high);
+                    ctx.lineTo(x, top);
+                    ctx.moveTo(x, bottom);
+                    ctx.lineTo(x, low);
+                }
+                ctx.fillStyle = CANDLE_COLORS[direction].fill;
+                ctx.fill();
+                ctx.strokeStyle = CANDLE_COLORS[direction].border;
+                ctx.stroke();
+            }
+            ctx.restore();
+        }
+    }
+    BatchedCandlestickController.id = 'batchedCandlestick';
+    Chart.register(BatchedCandlestickController);
+    return true;
+}
+
+// Write bar columns into an array of candles (index as x to remove gaps), reusing candles whose bar is unchanged
+function updateCandles(candles, data) {
+    for (let index = 0; index < data.count; index++) {
+        const existing = candles[index];
+        if (existing && existing.o === data.open[index] && existing.h === data.high[index] &&
+            existing.l === data.low[index] && existing.c === data.close[index] &&
+            existing.t === Date.parse(data.timestamp[index])) {
+            continue;
+        }
+        candles[index] = {
+            x: index,
+            o: data.open[index],
+            h: data.high[index],
+            l: data.low[index],
+            c: data.close[index],
+            t: Date.parse(data.timestamp[index]) // Epoch ms, for tooltip and tick labels
+        };
+    }
+    candles.length = data.count;
+    return candles;
+}
+
+// Function to load and update candlestick chart
+async function loadCandlestickChart() {
+    try {
+        if (typeof Chart === 'undefined' || typeof Chart.register === 'undefined') {
+            console.error('Chart.js is not loaded!');
+            return;
+        }
+
+        // Check if timeframe changed - if so, recreate the chart
+        const timeframeChanged = selectedTimeframe !== previousTimeframe;
+        if (timeframeChanged) {
+            console.log(`Timeframe changed from ${previousTimeframe} to ${selectedTimeframe}, recreating chart`);
+            previousTimeframe = selectedTimeframe;
+            // Destroy existing charts to force recreation
+            if (marketChart) {
+                marketChart.destroy();
+                marketChart = null;
+            }
+            if (rsiChart) {
+                rsiChart.destroy();
+                rsiChart = null;
+            }
+            allCandlestickData = []; // Clear existing data
+        }
+
+        // Bars, RSI history and config come from one request; skip rendering if nothing changed
+        // Long histories are downsampled server-side to about one candle per device pixel
+        const chartWidth = Math.round(chartCtx.canvas.clientWidth * (window.devicePixelRatio || 1));
+        const params = new URLSearchParams({ timeframe: selectedTimeframe, width: chartWidth });
+        if (chartVersion !== null && !timeframeChanged && marketChart) {
+            params.set('version', chartVersion);
+            params.set('buckets', chartBuckets);
+        }
+        const response = await fetch(`/api/chart-snapshot?${params}`);
+        if (response.status === 304) {
+            return;
+        }
+        const snapshot = await response.json();
+        chartVersion = snapshot.version;
+        liveChartVersion = snapshot.version;
+        chartBuckets = snapshot.buckets;
+        rsiHistory = snapshot.rsi;
+        applyConfig(snapshot.config);
+        const data = snapshot.bars;
+
+        if (!data.count) {
+            console.log(`No bars data available yet for ${selectedTimeframe}`);
+            return;
+        }
+
+        const isInitialLoad = !marketChart;
+        // Store previous data length to detect new candles
+        const previousDataLength = allCandlestickData.length;
+
+        // Convert bar columns to candlestick format; once the chart exists its data array is
+        // updated in place so unchanged candles are not rebuilt
+        const newCandlestickData = updateCandles(isInitialLoad ? [] : allCandlestickData, data);
+
+        // Preserve current zoom level if chart exists
+        // On initial load, show only the rightmost portion (latest ~200 bars) for auto-scroll
+        // On subsequent loads, preserve the current zoom level
+        let preservedMin = 0;
+        let preservedMax = newCandlestickData.length - 1;
+
+        if (isInitialLoad && newCandlestickData.length > 0) {
+            // Show only the rightmost portion (latest 200 bars, or all if less than 200)
+            const visibleBars = Math.min(200, newCandlestickData.length);
+            preservedMin = Math.max(0, newCandlestickData.length - visibleBars);
+            preservedMax = newCandlestickData.length - 1;
+            // Add margin
+            const margin = addChartMargin(preservedMin, preservedMax, newCandlestickData.length);
+            preservedMin = margin.min;
+            preservedMax = margin.max;
+        } else if (!isInitialLoad && marketChart && marketChart.scales && marketChart.scales.x) {
+            // Preserve current zoom level (remove margin first, then re-add)
+            let currentMin = marketChart.scales.x.min;
+            let currentMax = marketChart.scales.x.max;
+            // Remove existing margin to get actual data range
+            currentMin = Math.max(0, currentMin + CHART_MARGIN_BARS);
+            currentMax = Math.max(currentMin, currentMax - CHART_MARGIN_BARS);
+            // Ensure preserved values are within valid range for new data
+            preservedMin = Math.max(0, Math.min(currentMin, newCandlestickData.length - 1));
+            preservedMax = Math.max(preservedMin + 1, Math.min(currentMax, newCandlestickData.length - 1));
+            // Add margin back
+            const margin = addChartMargin(preservedMin, preservedMax, newCandlestickData.length);
+            preservedMin = margin.min;
+            preservedMax = margin.max;
+        }
+
+        // Update the global data array
+        allCandlestickData = newCandlestickData;
+
+        // If chart already exists, update it instead of recreating (preserves zoom)
+        if (marketChart && !isInitialLoad) {
+            // Check if we should auto-scroll (user is at rightmost position)
+            const wasAtRightmost = preservedMax >= (previousDataLength - 1.5); // Allow small tolerance
+            const hasNewData = newCandlestickData.length > previousDataLength;
+
+            // Chart data was updated in place; update zoom limits for new data length
+            if (marketChart.options.plugins.zoom.zoom.limits) {
+                marketChart.options.plugins.zoom.zoom.limits.x.max = allCandlestickData.length - 1;
+            }
+
+            // Auto-scroll to rightmost if user was already there and new data arrived
+            if (wasAtRightmost && hasNewData) {
+                // Auto-scroll to show latest data
+                // Remove margin to get actual data range
+                let actualMin = Math.max(0, preservedMin + CHART_MARGIN_BARS);
+                let actualMax = allCandlestickData.length - 1;
+                // Keep the same zoom range (width of visible area)
+                const range = actualMax - actualMin;
+                actualMin = Math.max(0, actualMax - range);
+                // Add margin back
+                const margin = addChartMargin(actualMin, actualMax, allCandlestickData.length);
+                preservedMin = margin.min;
+                preservedMax = margin.max;
+            } else {
+                // Preserve zoom level by setting min/max before update
+                // Remove margin first
+                let actualMin = Math.max(0, preservedMin + CHART_MARGIN_BARS);
+                let actualMax = Math.max(actualMin + 1, preservedMax - CHART_MARGIN_BARS);
+                // Ensure within valid range
+                actualMin = Math.max(0, Math.min(actualMin, allCandlestickData.length - 1));
+                actualMax = Math.max(actualMin + 1, Math.min(actualMax, allCandlestickData.length - 1));
+                // Add margin back
+                const margin = addChartMargin(actualMin, actualMax, allCandlestickData.length);
+                preservedMin = margin.min;
+                preservedMax = margin.max;
+            }
+
+            marketChart.options.scales.x.min = preservedMin;
+            marketChart.options.scales.x.max = preservedMax;
+            // Update the chart (this preserves or updates zoom)
+            marketChart.update('none');
+            // Reload RSI chart to sync with updated data
+            loadRSIChart();
+            return; // Exit early, chart is updated
+        }
+
+        // Destroy existing chart if it exists (should only happen on initial load or errors)
+        if (marketChart) {
+            marketChart.destroy();
+        }
+
+        // Update chart title
+        const chartTitle = document.getElementById('chartTitle');
+        if (chartTitle) {
+            chartTitle.textContent = `SPY candlestick chart`;
+        }
+
+        // Create new candlestick chart (only on initial load)
+        ensureCandlestickControllerRegistered();
+        marketChart = new Chart(chartCtx, {
+            type: 'batchedCandlestick',
+            plugins: [rsiSyncPlugin],
+            data: {
+                datasets: [{
+                    label: `SPY ${selectedTimeframe}`,
+                    data: allCandlestickData,
+                    pointRadius: 0,
+                    borderWidth: 1
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                // Data is already in internal format ({x, o, h, l, c}, sorted unique x)
+                parsing: false,
+                normalized: true,
+                layout: {
+                    padding: 0  // No padding to ensure exact alignment
+                },
+                plugins: {
+                    zoom: {
+                        pan: {
+                            enabled: true,
+                            mode: 'x',
+                            threshold: 10,
+                            modifierKey: null
+                        },
+                        zoom: {
+                            wheel: {
+                                enabled: true,
+                                speed: 0.05,
+                                modifierKey: null
+                            },
+                            pinch: {
+                                enabled: true
+                            },
+                            drag: {
+                                enabled: true,
+                                modifierKey: null
+                            },
+                            mode: 'x',
+                            limits: {
+                                // Allow zoom/pan within actual data range, but display will show margin
+                                x: { 
+                                    min: -CHART_MARGIN_BARS, 
+                                    max: allCandlestickData.length - 1 + CHART_MARGIN_BARS 
+                                }
+                            }
+                        }
+                    },
+                    legend: {
+                        display: false
+                    },
+                    tooltip: {
+                        enabled: true,
+                        callbacks: {
+                            title: function(context) {
+                                const point = context[0].raw;
+                                if (point.t) {
+                                    return DATE_TIME_FORMAT.format(point.t);
+                                }
+                                return 'Bar ' + point.x;
+                            },
+                            label: function(context) {
+                                const point = context.raw;
+                                return [
+                                    'O: $' + point.o.toFixed(2),
+                                    'H: $' + point.h.toFixed(2),
+                                    'L: $' + point.l.toFixed(2),
+                                    'C: $' + point.c.toFixed(2)
+                                ];
+                            }
+                        }
+                    }
+                },
+                scales: {
+                    x: {
+                        type: 'linear',
+                        position: 'bottom',
+                        offset: false,  // Don't add padding that could cause misalignment
+                        ticks: { 
+                            color: '#b0b0b0',
+                            maxRotation: 45,
+                            minRotation: 45,
+                            stepSize: Math.max(1, Math.floor(allCandlestickData.length / 10)),
+                            callback: function(value, index, ticks) {
+                                const candle = allCandlestickData[Math.round(value)];
+                                return candle ? candleTickLabel(candle) : '';
+                            }
+                        },
+                        grid: { color: '#333' },
+                        min: preservedMin, // Preserve zoom level or show all data by default (includes margin)
+                        max: preservedMax
+                    },
+                    y: {
+                        beginAtZero: false,
+                        ticks: { color: '#4CAF50' },
+                        grid: { color: '#333' },
+                        title: {
+                            display: true,
+                            text: 'Price ($)',
+                            color: '#4CAF50'
+                        }
+                    }
+                }
+            }
+        });
+
+        // Load and update RSI chart
+        loadRSIChart();
+    } catch (error) {
+        console.error('Error loading candlestick chart:', error);
+    }
+}
+
+// Function to load and update RSI chart
+async function loadRSIChart() {
+    try {
+        if (typeof Chart === 'undefined' || typeof Chart.register === 'undefined') {
+            console.error('Chart.js is not loaded!');
+            return;
+        }
+
+        // Use the RSI history from the latest chart snapshot
+        let data = rsiHistory;
+        if (!data) {
+            // Calls made while a request is in flight share it instead of fetching again
+            if (!rsiHistoryRequest) {
+                rsiHistoryRequest = fetch('/api/rsi-history')
+                    .then(response => response.json())
+                    .finally(() => { rsiHistoryRequest = null; });
+            }
+            data = await rsiHistoryRequest;
+        }
+
+        // Get RSI data for selected timeframe
+        const rsiKey = `rsi_${selectedTimeframe}`;
+        const rsiDataForTimeframe = data[rsiKey] || [];
+
+        if (!rsiDataForTimeframe || rsiDataForTimeframe.length === 0) {
+            console.log(`No RSI data available yet for ${selectedTimeframe}`);
+            return;
+        }
+
+        // Update RSI chart title
+        const rsiChartTitle = document.getElementById('rsiChartTitle');
+        if (rsiChartTitle) {
+            rsiChartTitle.textContent = `RSI ${selectedTimeframe}`;
+        }
+
+        // Create RSI chart data - align with main chart indices
+        const datasets = [];
+
+        // Helper function to filter and map RSI data points
+        function createRSIDataset(rsiData, label, color, bgColor) {
+            if (!rsiData || rsiData.length === 0) return null;
+
+            // RSI points only exist where candlesticks exist (candle indices are 0..length-1)
+            const candleCount = allCandlestickData.length;
+            const isValid = point => point.index >= 0 && point.index < candleCount;
+            const toChartPoint = point => ({
+                x: point.index,
+                y: point.rsi,
+                t: allCandlestickData[point.index].t  // Store timestamp for tooltip
+            });
+
+            let filteredData;
+            const cache = rsiPointsCache;
+            if (cache.source === rsiData && cache.sourceCount > 0 && rsiData.length >= cache.sourceCount) {
+                // Same history array, only changed by bar deltas (last point replaced, newer points
+                // appended in index order): keep the points built for everything before its old last point
+                filteredData = cache.points.slice(0, cache.stableCount);
+                for (let i = cache.sourceCount - 1; i < rsiData.length; i++) {
+                    if (isValid(rsiData[i])) {
+                        filteredData.push(toChartPoint(rsiData[i]));
+                    }
+                }
+            } else {
+                // Only include points at valid candlestick indices, in one pass
+                filteredData = new Array(rsiData.length);
+                let count = 0;
+                let sorted = true;
+                for (let i = 0; i < rsiData.length; i++) {
+                    const point = rsiData[i];
+                    if (!isValid(point)) continue;
+                    if (count > 0 && point.index < filteredData[count - 1].x) sorted = false;
+                    filteredData[count++] = toChartPoint(point);
+                }
+                filteredData.length = count;
+                // The server sends points in index order; sort only if that ever changes
+                if (!sorted) {
+                    filteredData.sort((a, b) => a.x - b.x);
+                }
+            }
+            rsiPointsCache = {
+                source: rsiData,
+                sourceCount: rsiData.length,
+                // Points not built from the last history point (which a bar delta may replace)
+                stableCount: filteredData.length - (isValid(rsiData[rsiData.length - 1]) ? 1 : 0),
+                points: filteredData
+            };
+
+            if (filteredData.length === 0) return null;
+
+            return {
+                label: label,
+                data: filteredData,
+                // Undecimated points (Chart.js swaps dataset.data for the decimated copy)
+                fullData: filteredData,
+                // Divergence markers for these points, computed on first draw
+                divergences: null,
+                borderColor: color,
+                backgroundColor: bgColor,
+                fill: false,
+                pointRadius: 0,
+                spanGaps: false  // Don't draw lines across gaps
+            };
+        }
+
+        // Create RSI dataset for selected timeframe
+        const rsiColors = {
+            '1min': '#2196F3',
+            '5min': '#FF9800',
+            '30min': '#9C27B0'
+        };
+        const rsiBgColors = {
+            '1min': 'rgba(33, 150, 243, 0.1)',
+            '5min': 'rgba(255, 152, 0, 0.1)',
+            '30min': 'rgba(156, 39, 176, 0.1)'
+        };
+
+        const rsiDataset = createRSIDataset(rsiDataForTimeframe, `RSI ${selectedTimeframe}`, 
+            rsiColors[selectedTimeframe] || '#2196F3', 
+            rsiBgColors[selectedTimeframe] || 'rgba(33, 150, 243, 0.1)');
+        if (rsiDataset) {
+            rsiDataset.timeframe = selectedTimeframe;
+            datasets.push(rsiDataset);
+
+            // Add MA if enabled
+            const showMA = document.getElementById('showMAToggle')?.checked || false;
+            if (showMA) {
+                const maTypeSelect = document.getElementById('rsiMAType');
+                let maType = maTypeSelect?.value || 'None';
+                const maLength = parseInt(document.getElementById('rsiMALength')?.value || '14');
+                // If checkbox is checked but type is None, default to SMA
+                if (maType === 'None') {
+                    maType = 'SMA';
+                    if (maTypeSelect) {
+                        maTypeSelect.value = 'SMA';
+                    }
+                }
+                if (maType !== 'None') {
+                    console.log(`Calculating MA for ${selectedTimeframe}: type=${maType}, length=${maLength}, rsiDataPoints=${rsiDataset.data.length}`);
+                    const maData = calculateMA(rsiDataset.data, maType, maLength);
+                    if (maData && maData.length > 0) {
+                        console.log(`✓ Added MA dataset for ${selectedTimeframe}: type=${maType}, length=${maLength}, dataPoints=${maData.length}`);
+                        const maDataset = {
+                            label: `RSI ${selectedTimeframe} MA`,
+                            data: maData,
+                            borderColor: '#FFEB3B',
+                            backgroundColor: 'rgba(255, 235, 59, 0.1)',
+                            fill: false,
+                            pointRadius: 0,
+                            spanGaps: false,
+                            timeframe: selectedTimeframe,
+                            isMA: true,
+                            maType: maType,
+                            hidden: false
+                        };
+                        datasets.push(maDataset);
+                    } else {
+                        console.warn(`✗ MA calculation returned no data for ${selectedTimeframe}: type=${maType}, length=${maLength}, rsiDataPoints=${rsiDataset.data.length}`);
+                    }
+                }
+            }
+        }
+
+        if (datasets.length === 0) return;
+
+        // Log dataset info for debugging
+        console.log(`RSI chart datasets for ${selectedTimeframe}:`, datasets.map(d => ({label: d.label, isMA: d.isMA || false, dataPoints: d.data ? d.data.length : 0})));
+
+        // Preserve current zoom level if RSI chart exists
+        let preservedMin = 0;
+        let preservedMax = allCandlestickData.length - 1;
+        const isInitialRSILoad = !rsiChart;
+
+        // Get current x-axis range from main chart - sync with main chart
+        if (marketChart && marketChart.scales && marketChart.scales.x) {
+            // Use actual scale values from main chart (preserve zoom, which includes margin)
+            preservedMin = marketChart.scales.x.min;
+            preservedMax = marketChart.scales.x.max;
+        } else if (allCandlestickData.length > 0) {
+            // Initial load - show all data with margin
+            const margin = addChartMargin(0, allCandlestickData.length - 1, allCandlestickData.length);
+            preservedMin = margin.min;
+            preservedMax = margin.max;
+        }
+
+        // If RSI chart already exists, update it instead of recreating (preserves zoom and sync)
+        if (rsiChart && !isInitialRSILoad) {
+            // Update datasets in place so Chart.js keeps their controllers and elements
+            const currentDatasets = rsiChart.data.datasets;
+            datasets.forEach((dataset, i) => {
+                if (currentDatasets[i] && currentDatasets[i].label === dataset.label) {
+                    Object.assign(currentDatasets[i], dataset);
+                } else {
+                    currentDatasets[i] = dataset;
+                }
+            });
+            currentDatasets.length = datasets.length;
+            // Preserve zoom level from main chart
+            rsiChart.options.scales.x.min = preservedMin;
+            rsiChart.options.scales.x.max = preservedMax;
+            // Update the chart (preserves zoom)
+            rsiChart.update('none');
+            return; // Exit early, chart is updated
+        }
+
+        // Destroy existing RSI chart if it exists (should only happen on initial load)
+        if (rsiChart) {
+            rsiChart.destroy();
+        }
+
+        // Ensure RSI levels plugin is registered before creating chart
+        ensureRSIPluginRegistered();
+
+        // Create RSI chart (only on initial load)
+        rsiChart = new Chart(rsiChartCtx, {
+            type: 'line',
+            data: {
+                datasets: datasets
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                layout: {
+                    padding: 0  // No padding to ensure exact alignment
+                },
+                interaction: {
+                    intersect: false,
+                    mode: 'index'
+                },
+                animation: false,  // Disable animation for instant sync
+                // Points are pre-built {x, y}; lets the decimation plugin thin long series
+                parsing: false,
+                normalized: true,
+                plugins: {
+                    decimation: {
+                        enabled: true,
+                        algorithm: 'lttb',
+                        samples: 500,
+                        threshold: 500
+                    },
+                    // rsiLevels plugin is registered globally, so it's automatically available
+                    legend: {
+                        display: true,
+                        labels: {
+                            color: '#e0e0e0',
+                            font: {
+                                size: 10
+                            }
+                        }
+                    },
+                    tooltip: {
+                        enabled: true,
+                        callbacks: {
+                            title: function(context) {
+                                // Show timestamp for alignment with candlestick chart
+                                const point = context[0];
+                                if (point && point.raw && point.raw.t) {
+                                    return DATE_TIME_FORMAT.format(point.raw.t);
+                                }
+                                // Fallback: use index to get timestamp from candlestick data
+                                const dataIndex = context[0].parsed.x;
+                                if (dataIndex >= 0 && dataIndex < allCandlestickData.length) {
+                                    return DATE_TIME_FORMAT.format(allCandlestickData[dataIndex].t);
+                                }
+                                return 'Bar ' + dataIndex;
+                            },
+                            label: function(context) {
+                                return context.dataset.label + ': ' + context.parsed.y.toFixed(2);
+                            }
+                        }
+                    },
+                    zoom: {
+                        pan: {
+                            enabled: false  // Disable pan - sync with main chart instead
+                        },
+                        zoom: {
+                            wheel: {
+                                enabled: false  // Disable zoom - sync with main chart instead
+                            }
+                        }
+                    }
+                },
+                scales: {
+                    x: {
+                        type: 'linear',
+                        position: 'bottom',
+                        ticks: {
+                            color: '#b0b0b0',
+                            font: {
+                                size: 9
+                            },
+                            display: false  // Hide x-axis labels on RSI chart (they're on main chart)
+                        },
+                        grid: {
+                            color: '#333',
+                            display: false  // Hide grid on RSI chart
+                        },
+                        min: preservedMin,
+                        max: preservedMax,
+                        // Ensure exact alignment with candlestick chart
+                        offset: false,  // Don't add padding that could cause misalignment
+                        afterUpdate: function(scale) {
+                            // Ensure RSI chart stays synced even if scales change
+                            if (marketChart && marketChart.scales && marketChart.scales.x) {
+                                scale.min = marketChart.scales.x.min;
+                                scale.max = marketChart.scales.x.max;
+                            }
+                        }
+                    },
+                    y: {
+                        ticks: {
+                            color: '#2196F3',
+                            font: {
+                                size: 9
+                            },
+                            stepSize: 10
+                        },
+                        grid: {
+                            color: '#333'
+                        },
+                        title: {
+                            display: true,
+                            text: 'RSI',
+                            color: '#2196F3',
+                            font: {
+                                size: 11
+                            }
+                        },
+                        min: 0,
+                        max: 100
+                    }
+                }
+            }
+        });
+
+    } catch (error) {
+        console.error('Error loading RSI chart:', error);
+    }
+}
+
+// Sync RSI chart x-axis with main chart
+function syncRSIChart() {
+    if (rsiChart && marketChart && marketChart.scales && marketChart.scales.x) {
+        const xMin = marketChart.scales.x.min;
+        const xMax = marketChart.scales.x.max;
+        // Skip the re-render when the range did not change (e.g. a data-only update)
+        if (rsiChart.options.scales.x.min === xMin && rsiChart.options.scales.x.max === xMax) {
+            return;
+        }
+        rsiChart.options.scales.x.min = xMin;
+        rsiChart.options.scales.x.max = xMax;
+        // Ensure the RSI chart uses the exact same scale configuration
+        rsiChart.options.scales.x.offset = false;  // Match candlestick chart
+        rsiChart.update('none');
+    }
+}
+
+// Candlestick chart plugin: every update (pan, zoom, new data, zoom buttons) re-syncs the RSI chart
+const rsiSyncPlugin = {
+    id: 'rsiSync',
+    afterUpdate: () => syncRSIChart()
+};
+
+// Zoom control functions (make them global)
+window.resetZoom = function() {
+    if (marketChart && allCandlestickData.length > 0) {
+        // Reset to show all data with margin
+        const margin = addChartMargin(0, allCandlestickData.length - 1, allCandlestickData.length);
+        marketChart.options.scales.x.min = margin.min;
+        marketChart.options.scales.x.max = margin.max;
+        marketChart.update('none');
+    }
+};
+
+window.zoomIn = function() {
+    if (marketChart && marketChart.scales && marketChart.scales.x && allCandlestickData.length > 0) {
+        // Remove margin to get actual data range
+        let currentMin = Math.max(0, marketChart.scales.x.min + CHART_MARGIN_BARS);
+        let currentMax = Math.min(allCandlestickData.length - 1, marketChart.scales.x.max - CHART_MARGIN_BARS);
+        const range = currentMax - currentMin;
+        const center = (currentMin + currentMax) / 2;
+        const newRange = range * 0.75; // Zoom in by 25%
+        currentMin = Math.max(0, center - newRange / 2);
+        currentMax = Math.min(allCandlestickData.length - 1, center + newRange / 2);
+        // Add margin back
+        const margin = addChartMargin(currentMin, currentMax, allCandlestickData.length);
+        marketChart.options.scales.x.min = margin.min;
+        marketChart.options.scales.x.max = margin.max;
+        marketChart.update('none');
+    }
+};
+
+window.zoomOut = function() {
+    if (marketChart && marketChart.scales && marketChart.scales.x && allCandlestickData.length > 0) {
+        // Remove margin to get actual data range
+        let currentMin = Math.max(0, marketChart.scales.x.min + CHART_MARGIN_BARS);
+        let currentMax = Math.min(allCandlestickData.length - 1, marketChart.scales.x.max - CHART_MARGIN_BARS);
+        const range = currentMax - currentMin;
+        const center = (currentMin + currentMax) / 2;
+        const newRange = range * 1.33; // Zoom out by 33%
+        currentMin = Math.max(0, center - newRange / 2);
+        currentMax = Math.min(allCandlestickData.length - 1, center + newRange / 2);
+        // Add margin back
+        const margin = addChartMargin(currentMin, currentMax, allCandlestickData.length);
+        marketChart.options.scales.x.min = margin.min;
+        marketChart.options.scales.x.max = margin.max;
+        marketChart.update('none');
+    }
+};
+
+// Setup controls event listeners
+function setupControls() {
+    // Timeframe selector
+    const timeframeSelector = document.getElementById('timeframeSelector');
+    if (timeframeSelector) {
+        // Load available timeframes and populate selector
+        fetch('/api/timeframes')
+            .then(response => response.json())
+            .then(data => {
+                availableTimeframes = data.timeframes || ['1min', '5min', '30min'];
+                timeframeSelector.innerHTML = '';
+                availableTimeframes.forEach(tf => {
+                    const option = document.createElement('option');
+                    option.value = tf;
+                    option.textContent = tf;
+                    if (tf === selectedTimeframe) {
+                        option.selected = true;
+                    }
+                    timeframeSelector.appendChild(option);
+                });
+            })
+            .catch(error => {
+                console.error('Error loading timeframes:', error);
+            });
+
+        timeframeSelector.addEventListener('change', function() {
+            selectedTimeframe = this.value;
+            loadCandlestickChart(); // Reload charts with new timeframe
+        });
+    }
+
+    // MA toggle - save and reload chart
+    const showMAToggle = document.getElementById('showMAToggle');
+    if (showMAToggle) {
+        showMAToggle.addEventListener('change', async () => {
+            try {
+                const result = await fetch('/api/config/show-rsi-ma', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify({value: showMAToggle.checked})
+                });
+                const data = await result.json();
+                if (data.success && rsiChart) {
+                    loadRSIChart(); // Reload to update MA display
+                }
+            } catch (error) {
+                console.error('Error setting show RSI MA:', error);
+            }
+        });
+    }
+
+    // MA type - save and reload chart
+    const maTypeEl = document.getElementById('rsiMAType');
+    if (maTypeEl) {
+        maTypeEl.addEventListener('change', async () => {
+            try {
+                const result = await fetch('/api/config/rsi-ma-type', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify({value: maTypeEl.value})
+                });
+                const data = await result.json();
+                if (data.success && rsiChart) {
+                    loadRSIChart(); // Reload to recalculate MAs
+                }
+            } catch (error) {
+                console.error('Error setting RSI MA type:', error);
+            }
+        });
+    }
+
+    // MA length - save and reload chart
+    const maLengthEl = document.getElementById('rsiMALength');
+    if (maLengthEl) {
+        maLengthEl.addEventListener('change', async () => {
+            try {
+                const result = await fetch('/api/config/rsi-ma-length', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify({value: parseInt(maLengthEl.value)})
+                });
+                const data = await result.json();
+                if (data.success && rsiChart) {
+                    loadRSIChart(); // Reload to recalculate MAs
+                }
+            } catch (error) {
+                console.error('Error setting RSI MA length:', error);
+            }
+        });
+    }
+
+    // Divergence toggle - save and update chart
+    const divergenceToggle = document.getElementById('divergenceToggle');
+    if (divergenceToggle) {
+        divergenceToggle.addEventListener('change', async () => {
+            try {
+                const result = await fetch('/api/config/show-divergence', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify({value: divergenceToggle.checked})
+                });
+                const data = await result.json();
+                if (data.success && rsiChart) {
+                    rsiChart.update('none'); // Just update to redraw divergence
+                }
+            } catch (error) {
+                console.error('Error setting show divergence:', error);
+            }
+        });
+    }
+}
+
+// Apply the newest bar pushed over the WebSocket without refetching the history
+function applyBarDelta(msg) {
+    // Deltas are numbered across all timeframes; older ones are already part of the snapshot
+    if (liveChartVersion === null || msg.version <= liveChartVersion) {
+        return;
+    }
+    if (msg.base_version !== liveChartVersion) {
+        // A delta was missed or settings changed: reload everything
+        resyncChart();
+        return;
+    }
+    liveChartVersion = msg.version;
+    if (msg.timeframe !== selectedTimeframe || !marketChart) {
+        // Other timeframes' deltas change nothing here, so the snapshot is still current
+        if (chartVersion === msg.base_version) {
+            chartVersion = msg.version;
+        }
+        return;
+    }
+
+    const count = allCandlestickData.length;
+    if (count === 0) {
+        resyncChart();
+        return;
+    }
+    const last = allCandlestickData[count - 1];
+    const barTime = Date.parse(msg.bar.timestamp);
+    let candle;
+    if (chartBuckets > 0) {
+        // Bucket boundaries depend on the total bar count, so they can't be kept exact in place:
+        // merge the bar into the last bucket and let the next poll reload the exact buckets
+        candle = {
+            x: last.x,
+            o: last.o,
+            h: Math.max(last.h, msg.bar.high),
+            l: Math.min(last.l, msg.bar.low),
+            c: msg.bar.close,
+            t: last.t
+        };
+        allCandlestickData[count - 1] = candle;
+    } else if (barTime >= last.t) {
+        candle = {
+            x: barTime === last.t ? last.x : count,
+            o: msg.bar.open,
+            h: msg.bar.high,
+            l: msg.bar.low,
+            c: msg.bar.close,
+            t: barTime
+        };
+        if (candle.x === last.x) {
+            // Still-forming bar changed
+            allCandlestickData[count - 1] = candle;
+        } else {
+            // New bar appended
+            allCandlestickData.push(candle);
+            if (marketChart.options.plugins.zoom.zoom.limits) {
+                marketChart.options.plugins.zoom.zoom.limits.x.max = allCandlestickData.length - 1;
+            }
+        }
+    } else {
+        resyncChart();
+        return;
+    }
+
+    // The candles match the server exactly unless they are bucketed or older bars slid out of
+    // its window; otherwise keep the old snapshot version so the next poll reconciles them
+    if (chartBuckets === 0 && msg.count === allCandlestickData.length && chartVersion === msg.base_version) {
+        chartVersion = msg.version;
+    }
+
+    // Update the cached RSI history in place, indexed like the candles; RSI is re-rendered
+    // with the candles (MA and divergences included)
+    const rsiKey = `rsi_${selectedTimeframe}`;
+    if (msg.rsi && rsiHistory && rsiHistory[rsiKey]) {
+        const history = rsiHistory[rsiKey];
+        const lastPoint = history.length > 0 ? history[history.length - 1] : null;
+        const point = Object.assign({}, msg.rsi, { index: candle.x });
+        if (lastPoint && lastPoint.index === candle.x) {
+            history[history.length - 1] = point;
+        } else if (!lastPoint || lastPoint.index < candle.x) {
+            history.push(point);
+        }
+    }
+    scheduleChartRender();
+}
+
+// Reload the chart once after a missed bar delta
+// (a hidden tab reloads when it becomes visible again)
+function resyncChart() {
+    if (chartResyncing || document.hidden || !marketChart) {
+        return;
+    }
+    chartResyncing = true;
+    loadCandlestickChart().finally(() => {
+        chartResyncing = false;
+    });
+}
+
+// Re-render after bar deltas, coalesced into one paint per animation frame
+// (animation frames don't run in hidden tabs, so background updates collapse into one)
+let chartRenderScheduled = false;
+function scheduleChartRender() {
+    if (chartRenderScheduled) {
+        return;
+    }
+    chartRenderScheduled = true;
+    requestAnimationFrame(() => {
+        chartRenderScheduled = false;
+        if (marketChart) {
+            marketChart.update('none');
+            loadRSIChart();
+        }
+    });
+}
+
+// Slow fallback poll to reconcile the full history; live updates arrive as bar_delta
+// messages over the WebSocket (loadCandlestickChart will call loadRSIChart when needed).
+// Skipped while the tab is hidden; becoming visible again reconciles immediately.
+const CHART_POLL_INTERVAL_MS = 30000;
+function scheduleChartPoll() {
+    setTimeout(async () => {
+        if (!document.hidden) {
+            await loadCandlestickChart();
+        }
+        scheduleChartPoll();
+    }, CHART_POLL_INTERVAL_MS);
+}
+scheduleChartPoll();
+document.addEventListener('visibilitychange', () => {
+    if (!document.hidden && marketChart) {
+        loadCandlestickChart();
+    }
+});
+// Initial chart load after ensuring Chart.js is loaded
+setTimeout(() => {
+    if (typeof Chart !== 'undefined') {
+        ensureRSIPluginRegistered();
+        setupControls(); // Setup controls first
+        loadCandlestickChart(); // Load charts
+    } else {
+        console.error('Chart.js failed to load');
+    }
+}, 100);
+
+// Load current config on page load
+async function loadConfig() {
+    try {
+        const response = await fetch('/api/config');
+        const config = await response.json();
+        applyConfig(config);
+    } catch (error) {
+        console.error('Error loading config:', error);
+    }
+}
+
+// Update controls only when the config actually changed (e.g. from another tab),
+// so chart polling doesn't overwrite inputs being edited
+function applyConfig(config) {
+    const configJSON = JSON.stringify(config);
+    if (configJSON !== lastConfigJSON) {
+        lastConfigJSON = configJSON;
+        updateButtonStates(config);
+    }
+}
+
+function updateButtonStates(config) {
+    const bypassStatus = document.getElementById('bypassStatus');
+    const mockStatus = document.getElementById('mockStatus');
+    const bypassBtn = document.getElementById('bypassBtn');
+    const mockBtn = document.getElementById('mockBtn');
+    const pollingIntervalInput = document.getElementById('pollingInterval');
+
+    // When bypass_market_hours is True, we respect market hours (Trade 24/7 OFF)
+    // When bypass_market_hours is False, we ignore market hours (Trade 24/7 ON)
+    if (config.bypass_market_hours) {
+        bypassStatus.textContent = 'OFF';  // Trade 24/7 is OFF (respecting market hours)
+        bypassBtn.style.borderColor = '#666';
+        bypassBtn.style.background = '#444';
+    } else {
+        bypassStatus.textContent = 'ON';  // Trade 24/7 is ON (ignoring market hours)
+        bypassBtn.style.borderColor = '#4CAF50';
+        bypassBtn.style.background = '#2d4a2d';
+    }
+
+    if (config.use_mock_data) {
+        mockStatus.textContent = 'ON';
+        mockBtn.style.borderColor = '#FF9800';
+        mockBtn.style.background = '#4a3a2d';
+    } else {
+        mockStatus.textContent = 'OFF';
+        mockBtn.style.borderColor = '#666';
+        mockBtn.style.background = '#444';
+    }
+
+    // Update polling interval input - always show a value (default to 30 if not set)
+    const pollingValue = config.polling_interval_seconds !== null && config.polling_interval_seconds !== undefined 
+        ? config.polling_interval_seconds 
+        : 30;
+    pollingIntervalInput.value = pollingValue;
+
+    // Update historical bars count input
+    const historicalBarsInput = document.getElementById('historicalBarsCount');
+    if (historicalBarsInput) {
+        const barsValue = config.historical_bars_count !== null && config.historical_bars_count !== undefined 
+            ? config.historical_bars_count 
+            : 2000;
+        historicalBarsInput.value = barsValue;
+    }
+
+    // Update RSI MA settings
+    const rsiMATypeSelect = document.getElementById('rsiMAType');
+    if (rsiMATypeSelect) {
+        const maType = config.rsi_ma_type !== null && config.rsi_ma_type !== undefined 
+            ? config.rsi_ma_type 
+            : 'None';
+        rsiMATypeSelect.value = maType;
+    }
+
+    const rsiMALengthInput = document.getElementById('rsiMALength');
+    if (rsiMALengthInput) {
+        const maLength = config.rsi_ma_length !== null && config.rsi_ma_length !== undefined 
+            ? config.rsi_ma_length 
+            : 14;
+        rsiMALengthInput.value = maLength;
+    }
+
+    const showMAToggle = document.getElementById('showMAToggle');
+    if (showMAToggle) {
+        showMAToggle.checked = config.show_rsi_ma === true;
+    }
+
+    const divergenceToggle = document.getElementById('divergenceToggle');
+    if (divergenceToggle) {
+        divergenceToggle.checked = config.show_divergence === true;
+    }
+}
+
+async function toggleBypassMarketHours() {
+    try {
+        const response = await fetch('/api/config');
+        const config = await response.json();
+        const newValue = !config.bypass_market_hours;
+
+        const result = await fetch('/api/config/bypass-market-hours', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({value: newValue})
+        });
+        const data = await result.json();
+        updateButtonStates(data);
+    } catch (error) {
+        console.error('Error toggling bypass market hours:', error);
+    }
+}
+
+async function toggleMockData() {
+    try {
+        const response = await fetch('/api/config');
+        const config = await response.json();
+        const newValue = !config.use_mock_data;
+
+        const result = await fetch('/api/config/mock-data', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({value: newValue})
+        });
+        const data = await result.json();
+        updateButtonStates(data);
+        // Mock data will take effect on next polling cycle (no restart needed)
+    } catch (error) {
+        console.error('Error toggling mock data:', error);
+    }
+}
+
+async function setPollingInterval() {
+    const input = document.getElementById('pollingInterval');
+    const value = parseInt(input.value);
+
+    if (isNaN(value) || value < 1) {
+        alert('Please enter a valid polling interval (minimum 1 second)');
+        return;
+    }
+
+    try {
+        const result = await fetch('/api/config/polling-interval', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({value: value})
+        });
+        const data = await result.json();
+
+        if (data.success) {
+            updateButtonStates(data);
+            alert(`Polling interval set to ${value} seconds. Changes take effect on the next polling cycle.`);
+        } else {
+            alert('Error setting polling interval: ' + data.message);
+        }
+    } catch (error) {
+        console.error('Error setting polling interval:', error);
+        alert('Error setting polling interval. Please try again.');
+    }
+}
+
+// Make setPollingInterval available globally
+window.setPollingInterval = setPollingInterval;
+
+async function setHistoricalBarsCount() {
+    const input = document.getElementById('historicalBarsCount');
+    const value = parseInt(input.value);
+
+    if (isNaN(value) || value < 100) {
+        alert('Please enter a valid historical bars count (minimum 100)');
+        return;
+    }
+
+    try {
+        const result = await fetch('/api/config/historical-bars-count', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({value: value})
+        });
+        const data = await result.json();
+
+        if (data.success) {
+            updateButtonStates(data);
+            alert(`Historical bars count set to ${value}. Changes take effect on the next data fetch cycle.`);
+        } else {
+            alert('Error setting historical bars count: ' + data.message);
+        }
+    } catch (error) {
+        console.error('Error setting historical bars count:', error);
+        alert('Error setting historical bars count. Please try again.');
+    }
+}
+
+// Make setHistoricalBarsCount available globally
+window.setHistoricalBarsCount = setHistoricalBarsCount;
+
+// Load config on page load
+loadConfig();
+
+// Load existing alerts on page load
+function handleMessage(msg) {
+    if (msg.type === 'snapshot') {
+        alertEpoch = msg.epoch;
+        if (msg.incremental) {
+            // Only alerts received since the last connection (newest first)
+            for (let i = msg.alerts.length - 1; i >= 0; i--) {
+                addAlert(msg.alerts[i]);
+            }
+        } else {
+            // Recent alerts sent on (re)connect replace whatever is displayed
+            lastAlertId = 0;
+            replaceAlerts(msg.alerts);
+        }
+        if (msg.alerts.length) {
+            lastAlertId = Math.max(lastAlertId, msg.alerts[0].id);
+        }
+        console.log(`Loaded ${msg.alerts.length} existing alerts from storage`);
+    } else if (msg.type === 'batch') {
+        // Several broadcasts coalesced into one frame, oldest first
+        msg.messages.forEach(handleMessage);
+    } else if (msg.type === 'bar_delta') {
+        applyBarDelta(msg);
+    } else {
+        lastAlertId = Math.max(lastAlertId, msg.id);
+        addAlert(msg);
+    }
+}
+
+// Function to clear all alerts
+async function clearAlerts() {
+    if (!confirm('Are you sure you want to clear all alerts? This cannot be undone.')) {
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/alerts', {
+            method: 'DELETE'
+        });
+        const data = await response.json();
+
+        if (data.success) {
+            // Clear the displayed alerts
+            clearAlertsDisplay();
+            console.log('All alerts cleared');
+        } else {
+            alert('Error clearing alerts: ' + data.message);
+        }
+    } catch (error) {
+        console.error('Error clearing alerts:', error);
+        alert('Error clearing alerts. Please try again.');
+    }
+}
+
+// Make clearAlerts available globally
+window.clearAlerts = clearAlerts;
+
+// Alert headings by signal type (as in AlertManager's messages)
+const SIGNAL_NAMES = {
+    oversold: '🔻 OVERSOLD',
+    overbought: '🔺 OVERBOUGHT',
+    bullish_divergence: '📈 BULLISH DIVERGENCE',
+    bearish_divergence: '📉 BEARISH DIVERGENCE'
+};
+
+// Alert elements are recycled: once MAX_VISIBLE_ALERTS are shown, the oldest one is refilled and moved to the top
+const MAX_VISIBLE_ALERTS = 50;
+// Timestamps of the displayed alerts, for duplicate detection without reading the DOM
+const displayedAlertTimestamps = new Set();
+
+function createAlertElement() {
+    const alertDiv = document.createElement('div');
+    const header = document.createElement('div');
+    header.className = 'alert-header';
+    const rsiValue = document.createElement('div');
+    rsiValue.className = 'rsi-value';
+    const details = document.createElement('div');
+    details.className = 'alert-details';
+    alertDiv.append(header, rsiValue, details);
+    alertDiv.fields = { header, rsiValue, details };
+    return alertDiv;
+}
+
+function clearAlertsDisplay() {
+    alertsDiv.textContent = '';
+    displayedAlertTimestamps.clear();
+}
+
+// Show a snapshot of alerts (newest first), built off-document and inserted in one operation
+function replaceAlerts(alerts) {
+    clearAlertsDisplay();
+    const fragment = document.createDocumentFragment();
+    // Oldest first, so duplicates keep the earliest alert as addAlert would
+    for (let i = alerts.length - 1; i >= 0; i--) {
+        if (!displayedAlertTimestamps.has(alerts[i].timestamp)) {
+            fragment.prepend(fillAlertElement(createAlertElement(), alerts[i]));
+        }
+    }
+    while (fragment.childNodes.length > MAX_VISIBLE_ALERTS) {
+        displayedAlertTimestamps.delete(fragment.lastChild.alertTimestamp);
+        fragment.lastChild.remove();
+    }
+    alertsDiv.append(fragment);
+}
+
+function fillAlertElement(alertDiv, alert) {
+    alertDiv.className = `alert ${alert.signal_type}`;
+    alertDiv.alertTimestamp = alert.timestamp;
+    displayedAlertTimestamps.add(alert.timestamp);
+
+    // Same heading as the first line of the server's alert message (which is not sent over the WebSocket)
+    const title = `${SIGNAL_NAMES[alert.signal_type] || alert.signal_type.toUpperCase()} - ${alert.symbol}`;
+
+    // textContent: no HTML parsing, and alert text cannot inject markup
+    const { header, rsiValue, details } = alertDiv.fields;
+    header.textContent = title;
+    rsiValue.textContent = `RSI: ${alert.rsi_value.toFixed(2)}`;
+    details.textContent = `Timeframe: ${alert.timeframe} | Confirmed: ${alert.confirmed ? 'YES' : 'NO'} | ` +
+        DATE_TIME_FORMAT.format(new Date(alert.timestamp));
+    return alertDiv;
+}
+
+function addAlert(alert) {
+    // Prevent duplicate alerts (skip if an alert with the same timestamp is displayed)
+    if (displayedAlertTimestamps.has(alert.timestamp)) {
+        console.log('Skipping duplicate alert:', alert);
+        return;
+    }
+
+    let alertDiv;
+    if (alertsDiv.children.length >= MAX_VISIBLE_ALERTS) {
+        alertDiv = alertsDiv.lastElementChild;
+        displayedAlertTimestamps.delete(alertDiv.alertTimestamp);
+    } else {
+        alertDiv = createAlertElement();
+    }
+    fillAlertElement(alertDiv, alert);
+    alertsDiv.prepend(alertDiv);
+}
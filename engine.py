@@ -1,5 +1,7 @@
 """Main RSI alerting engine."""
 import os
+import signal as process_signal
+import threading
 import time
 from typing import Dict, List
 from datetime import datetime
@@ -156,7 +158,7 @@ class RSIEngine:
             bars = self.bars_cache.get(timeframe, [])
             if bars:
                 # Get latest RSI for alerts
-                rsi_value = self.detector.rsi.get_latest(bars)
+                rsi_value = self.detector.rsi.get_latest(bars, timeframe)
                 if current_price is None:
                     current_price = bars[-1].close if bars else None
                 if rsi_value is not None:
@@ -164,13 +166,9 @@ class RSIEngine:
                 
                 # Calculate RSI for all bars and store history
                 # Use bar index directly for each timeframe (no mapping needed)
-                rsi_values = self.detector.rsi.calculate(bars)
-                # Clear and rebuild history for this timeframe
-                runtime_config.clear_rsi_history(timeframe)
-                for i, rsi_val in enumerate(rsi_values):
-                    if rsi_val is not None and i < len(bars):
-                        # Use the bar's own index (not mapped to 1min)
-                        runtime_config.add_rsi_point(timeframe, bars[i].timestamp, rsi_val, i)
+                rsi_values = self.detector.rsi.calculate(bars, timeframe)
+                # Rebuild history for this timeframe (points use the bar's own index, not mapped to 1min)
+                runtime_config.set_rsi_history(timeframe, bars, rsi_values)
                 if rsi_value is not None and current_price is not None:
                     print(f"[{timeframe}] Bars: {len(bars)}, Price: ${current_price:.2f}, RSI: {rsi_value:.2f}")
                 elif rsi_value is not None:
@@ -200,9 +198,9 @@ class RSIEngine:
                 # Send to dashboard
                 broadcast_alert(signal, message)
                 
-                # Send to Discord if enabled
+                # Send to Discord if enabled (batched with other alerts from this burst)
                 if self.discord:
-                    self.discord.send_alert(message)
+                    self.discord.queue_alert(message)
                 
                 # Record alert
                 self.alert_manager.record_alert(signal)
@@ -219,16 +217,28 @@ class RSIEngine:
         print(f"Polling interval: {initial_interval}s (configurable via web UI)")
         print("-" * 50)
         
-        while True:
-            try:
-                self.run_once()
-            except KeyboardInterrupt:
-                print("\nStopping engine...")
-                break
-            except Exception as e:
-                print(f"Error in main loop: {e}")
-            
-            # Use runtime config polling interval if set, otherwise use config value
-            interval = runtime_config.get_polling_interval(self.config.polling_interval_seconds)
-            time.sleep(interval)
-
+        # Turn SIGTERM into SystemExit so queued Discord alerts are flushed below
+        if threading.current_thread() is threading.main_thread():
+            process_signal.signal(process_signal.SIGTERM, self._handle_sigterm)
+        
+        try:
+            while True:
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Error in main loop: {e}")
+                
+                # Use runtime config polling interval if set, otherwise use config value
+                interval = runtime_config.get_polling_interval(self.config.polling_interval_seconds)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\nStopping engine...")
+        finally:
+            if self.discord:
+                self.discord.close()
+    
+    @staticmethod
+    def _handle_sigterm(signum, frame):
+        """Stop the engine loop on SIGTERM."""
+        print("\nReceived SIGTERM, stopping engine...")
+        raise SystemExit(0)
@@ -1,7 +1,58 @@
 """RSI indicator implementation using Wilder's smoothing method."""
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import numpy as np
 from providers.base import Bar
 
+try:
+    from numba import njit
+except ImportError:  # Optional speedup; fall back to the pure-Python loop
+    njit = None
+
+
+@dataclass
+class _SeriesState:
+    """Closes, Wilder averages and RSI values from the previous calculation of a series."""
+    closes: List[float] = field(default_factory=list)
+    avg_gains: List[Optional[float]] = field(default_factory=list)
+    avg_losses: List[Optional[float]] = field(default_factory=list)
+    values: List[Optional[float]] = field(default_factory=list)
+
+
+def _wilder_smooth(gains, losses, avg_gain, avg_loss, period, avg_gains, avg_losses, values):
+    """
+    Run Wilder's smoothing over gains and losses, writing averages and RSI values to the outputs.
+    
+    Args:
+        gains: Gain per bar (0 where the close fell)
+        losses: Loss per bar (0 where the close rose)
+        avg_gain: Average gain before the first bar
+        avg_loss: Average loss before the first bar
+        period: RSI period
+        avg_gains: Output average gain per bar
+        avg_losses: Output average loss per bar
+        values: Output RSI per bar
+    """
+    for i in range(len(gains)):
+        # Wilder's smoothing: EMA-like calculation
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        
+        # Calculate RS and RSI
+        if avg_loss == 0:
+            rs = 100.0  # Avoid division by zero
+        else:
+            rs = avg_gain / avg_loss
+        
+        avg_gains[i] = avg_gain
+        avg_losses[i] = avg_loss
+        values[i] = 100 - (100 / (1 + rs))
+
+
+if njit is not None:
+    # No fastmath: results must match the pure-Python loop bit for bit
+    _wilder_smooth = njit(cache=True)(_wilder_smooth)
+
 
 class RSI:
     """RSI calculator using Wilder's smoothing method."""
@@ -14,68 +65,114 @@ class RSI:
             period: RSI period (default 14)
         """
         self.period = period
+        # Last calculation per named series, resumed when the next call shares its leading closes
+        self._series: Dict[str, _SeriesState] = {}
     
-    def calculate(self, bars: List[Bar]) -> List[float]:
+    def calculate(self, bars: List[Bar], series: Optional[str] = None) -> List[float]:
         """
         Calculate RSI values for a series of bars.
         
         Args:
             bars: List of Bar objects (must be sorted by timestamp)
-            
+            series: Name of the bar series (e.g. timeframe); repeated calls for the same
+                series only recompute values from the first bar whose close changed
+        
         Returns:
             List of RSI values (same length as bars, None for insufficient data)
         """
-        if len(bars) < self.period + 1:
-            return [None] * len(bars)
-        
-        # Extract closing prices
-        closes = [bar.close for bar in bars]
-        
-        # Calculate price changes
-        deltas = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-        
-        # Separate gains and losses
-        gains = [delta if delta > 0 else 0.0 for delta in deltas]
-        losses = [-delta if delta < 0 else 0.0 for delta in deltas]
-        
-        # Calculate initial average gain and loss (SMA)
-        avg_gain = sum(gains[:self.period]) / self.period
-        avg_loss = sum(losses[:self.period]) / self.period
-        
-        rsi_values = [None] * self.period
-        
-        # Calculate RS and RSI using Wilder's smoothing
-        for i in range(self.period, len(gains)):
-            # Wilder's smoothing: EMA-like calculation
-            avg_gain = (avg_gain * (self.period - 1) + gains[i]) / self.period
-            avg_loss = (avg_loss * (self.period - 1) + losses[i]) / self.period
-            
-            # Calculate RS and RSI
-            if avg_loss == 0:
-                rs = 100  # Avoid division by zero
-            else:
-                rs = avg_gain / avg_loss
-            
-            rsi = 100 - (100 / (1 + rs))
-            rsi_values.append(rsi)
-        
-        # Pad with None for the first bar (no previous bar to calculate delta)
-        return [None] + rsi_values
+        return list(self._calculate(bars, series).values)
     
-    def get_latest(self, bars: List[Bar]) -> float:
+    def get_latest(self, bars: List[Bar], series: Optional[str] = None) -> float:
         """
         Get the latest RSI value.
         
         Args:
             bars: List of Bar objects
-            
+            series: Name of the bar series (see calculate)
+        
         Returns:
             Latest RSI value or None if insufficient data
         """
-        rsi_values = self.calculate(bars)
+        rsi_values = self._calculate(bars, series).values
         return rsi_values[-1] if rsi_values else None
-
-
-
-
-
+    
+    def _calculate(self, bars: List[Bar], series: Optional[str]) -> _SeriesState:
+        """Calculate RSI state for bars, reusing the previous state of the series where possible."""
+        closes = [bar.close for bar in bars]
+        previous = self._series.get(series) if series is not None else None
+        
+        # Values up to a bar depend only on the closes up to it, so a shared prefix is reused
+        # (typically only the still-forming last bar changed, or nothing did)
+        reuse = 0
+        if previous is not None:
+            common = min(len(closes), len(previous.closes))
+            if closes[:common] == previous.closes[:common]:
+                reuse = common
+            elif common > 0 and closes[:common - 1] == previous.closes[:common - 1]:
+                reuse = common - 1
+        if reuse == len(closes) and previous is not None and len(previous.closes) == reuse:
+            return previous
+        
+        # The seed average covers the first period changes, so it must be kept intact
+        if reuse > self.period:
+            state = _SeriesState(
+                closes,
+                previous.avg_gains[:reuse],
+                previous.avg_losses[:reuse],
+                previous.values[:reuse]
+            )
+            self._extend(state, reuse)
+        else:
+            state = _SeriesState(closes)
+            self._extend(state, 0)
+        
+        if series is not None:
+            self._series[series] = state
+        return state
+    
+    def _extend(self, state: _SeriesState, start: int):
+        """
+        Fill in averages and RSI values for bars from start onward.
+        
+        Args:
+            state: State whose lists are complete up to (not including) start
+            start: First bar to calculate (0, or a bar after the seed average)
+        """
+        closes = state.closes
+        period = self.period
+        if len(closes) < period + 1:
+            state.avg_gains = [None] * len(closes)
+            state.avg_losses = [None] * len(closes)
+            state.values = [None] * len(closes)
+            return
+        
+        # Price changes for the bars to calculate (vectorized), split into gains and losses
+        deltas = np.diff(np.asarray(closes[start - 1:] if start else closes, dtype=np.float64))
+        gains = np.maximum(deltas, 0.0)
+        losses = np.maximum(-deltas, 0.0)
+        
+        if start == 0:
+            # Calculate initial average gain and loss (SMA) over the first period changes
+            avg_gain = sum(gains[:period].tolist()) / period
+            avg_loss = sum(losses[:period].tolist()) / period
+            # No RSI is reported for the seed bar itself
+            state.avg_gains = [None] * period + [avg_gain]
+            state.avg_losses = [None] * period + [avg_loss]
+            state.values = [None] * (period + 1)
+            gains = gains[period:]
+            losses = losses[period:]
+        else:
+            avg_gain = state.avg_gains[start - 1]
+            avg_loss = state.avg_losses[start - 1]
+        
+        count = len(gains)
+        if njit is not None:
+            avg_gains, avg_losses, values = np.empty(count), np.empty(count), np.empty(count)
+            _wilder_smooth(gains, losses, avg_gain, avg_loss, period, avg_gains, avg_losses, values)
+            avg_gains, avg_losses, values = avg_gains.tolist(), avg_losses.tolist(), values.tolist()
+        else:
+            avg_gains, avg_losses, values = [0.0] * count, [0.0] * count, [0.0] * count
+            _wilder_smooth(gains.tolist(), losses.tolist(), avg_gain, avg_loss, period, avg_gains, avg_losses, values)
+        state.avg_gains.extend(avg_gains)
+        state.avg_losses.extend(avg_losses)
+        state.values.extend(values)
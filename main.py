@@ -1,5 +1,6 @@
 """Main entry point for RSI Live Alerter."""
 import os
+import importlib.util
 import uvicorn
 import threading
 from dotenv import load_dotenv
@@ -14,11 +15,18 @@ load_dotenv()
 def run_api():
     """Run FastAPI server in separate thread."""
     port = int(os.getenv("PORT", "8000"))
+    # uvloop/httptools come with uvicorn[standard]; fall back where unavailable (e.g. Windows)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
     uvicorn.run(
         "api.main:app",
         host="0.0.0.0",
         port=port,
-        log_level="info"
+        log_level="info",
+        loop=loop,
+        http=http,
+        ws="websockets",
+        ws_per_message_deflate=True
     )
 
 
@@ -69,7 +69,7 @@ class SignalDetector:
             if timeframe in bars_by_timeframe:
                 bars = bars_by_timeframe[timeframe]
                 if len(bars) >= self.config.period + 1:
-                    rsi_value = self.rsi.get_latest(bars)
+                    rsi_value = self.rsi.get_latest(bars, timeframe)
                     current_rsi[timeframe] = rsi_value
                 else:
                     current_rsi[timeframe] = None
@@ -195,7 +195,7 @@ class SignalDetector:
             return signals
         
         # Calculate RSI for all bars
-        rsi_values = self.rsi.calculate(bars)
+        rsi_values = self.rsi.calculate(bars, timeframe)
         if len(rsi_values) < 20:
             return signals
         
@@ -0,0 +1,76 @@
+"""Tests for alerts.storage.AlertStorage."""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alerts.storage import AlertStorage
+
+
+class LegacyMigrationTest(unittest.TestCase):
+    """Upgrading from the JSON array file to JSON Lines keeps the history."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.jsonl = self.dir / "alerts_history.jsonl"
+        self.legacy = self.dir / "alerts_history.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_legacy(self, count):
+        # Legacy file is a JSON array, most recent first
+        alerts = [{"timestamp": f"t{i}", "n": i} for i in range(count - 1, -1, -1)]
+        with open(self.legacy, 'w', encoding='utf-8') as f:
+            json.dump(alerts, f, indent=2)
+        return alerts
+
+    def test_migrates_legacy_array(self):
+        alerts = self._write_legacy(5)
+
+        storage = AlertStorage(storage_file=str(self.jsonl))
+
+        self.assertTrue(self.jsonl.exists())
+        self.assertFalse(self.legacy.exists())
+        self.assertTrue((self.dir / "alerts_history.json.migrated").exists())
+        self.assertEqual(storage.load_alerts(), alerts)
+
+        # File is stored oldest first, one alert per line
+        lines = self.jsonl.read_text(encoding='utf-8').splitlines()
+        self.assertEqual([json.loads(line)["n"] for line in lines], [0, 1, 2, 3, 4])
+
+        # A fresh instance reads the migrated file
+        self.assertEqual(AlertStorage(storage_file=str(self.jsonl)).load_alerts(), alerts)
+
+    def test_keeps_newest_alerts_only(self):
+        alerts = self._write_legacy(AlertStorage.MAX_STORED_ALERTS + 50)
+
+        storage = AlertStorage(storage_file=str(self.jsonl))
+
+        stored = storage.load_alerts(max_alerts=AlertStorage.MAX_STORED_ALERTS + 50)
+        self.assertEqual(stored, alerts[:AlertStorage.MAX_STORED_ALERTS])
+
+    def test_new_file_takes_precedence(self):
+        self._write_legacy(3)
+        self.jsonl.write_text(json.dumps({"timestamp": "new"}) + "\n", encoding='utf-8')
+
+        storage = AlertStorage(storage_file=str(self.jsonl))
+
+        self.assertEqual(storage.load_alerts(), [{"timestamp": "new"}])
+        self.assertTrue(self.legacy.exists())
+
+    def test_appends_after_migration(self):
+        self._write_legacy(2)
+        storage = AlertStorage(storage_file=str(self.jsonl))
+        storage.save_alert({"timestamp": "t2", "n": 2})
+
+        reloaded = AlertStorage(storage_file=str(self.jsonl)).load_alerts()
+        self.assertEqual([a["n"] for a in reloaded], [2, 1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
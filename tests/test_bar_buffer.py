@@ -0,0 +1,118 @@
+"""Tests for api.bar_buffer.BarBuffer."""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api.bar_buffer import BarBuffer
+from providers.base import Bar
+
+START = datetime(2024, 1, 2, 9, 30)
+
+
+def make_bars(first, count, close=100.0):
+    """Minute bars numbered first..first+count-1, with close offset by the bar number."""
+    return [
+        Bar(timestamp=START + timedelta(minutes=i), open=close + i, high=close + i + 1,
+            low=close + i - 1, close=close + i + 0.5, volume=1000 + i)
+        for i in range(first, first + count)
+    ]
+
+
+def assert_holds(buffer, bars):
+    columns = buffer.columns()
+    assert len(buffer) == len(bars)
+    assert columns["timestamp"] == [bar.timestamp.isoformat() for bar in bars]
+    for name in ("open", "high", "low", "close", "volume"):
+        assert columns[name].tolist() == [getattr(bar, name) for bar in bars]
+
+
+def test_initial_sync_loads_window():
+    buffer = BarBuffer(capacity=8)
+    bars = make_bars(0, 5)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+    assert buffer.version == 1
+
+
+def test_append_new_bars():
+    buffer = BarBuffer(capacity=8)
+    buffer.sync(make_bars(0, 5))
+    bars = make_bars(0, 7)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+    assert buffer.version == 2
+
+
+def test_unchanged_window_keeps_version():
+    buffer = BarBuffer(capacity=8)
+    buffer.sync(make_bars(0, 5))
+    buffer.sync(make_bars(0, 5))
+    assert buffer.version == 1
+
+
+def test_sliding_window_wraps_ring():
+    buffer = BarBuffer(capacity=6)
+    buffer.sync(make_bars(0, 6))
+    for first in range(1, 10):
+        bars = make_bars(first, 6)
+        buffer.sync(bars)
+        assert_holds(buffer, bars)
+    assert buffer.capacity == 6
+
+
+def test_forming_bar_is_overwritten():
+    buffer = BarBuffer(capacity=8)
+    bars = make_bars(0, 5)
+    buffer.sync(bars)
+    bars[-1] = Bar(timestamp=bars[-1].timestamp, open=bars[-1].open, high=200.0,
+                   low=bars[-1].low, close=199.5, volume=5000)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+    assert buffer.version == 2
+
+
+def test_revised_bar_in_middle_reloads():
+    buffer = BarBuffer(capacity=8)
+    bars = make_bars(0, 5)
+    buffer.sync(bars)
+    bars[2] = Bar(timestamp=bars[2].timestamp, open=1.0, high=2.0, low=0.5, close=1.5, volume=7)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+    assert buffer.version == 2
+
+
+def test_changed_timestamp_in_window_reloads():
+    buffer = BarBuffer(capacity=8)
+    buffer.sync(make_bars(0, 5))
+    # Window slid by one and still ends on bar 4, but bar 3 was replaced by a backfilled bar
+    backfilled = Bar(timestamp=START + timedelta(minutes=2, seconds=30), open=1.0, high=2.0,
+                     low=0.5, close=1.5, volume=7)
+    bars = make_bars(1, 2) + [backfilled] + make_bars(4, 1)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+
+
+def test_misaligned_window_reloads():
+    buffer = BarBuffer(capacity=8)
+    buffer.sync(make_bars(0, 5))
+    bars = make_bars(100, 4)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+
+
+def test_larger_window_grows_capacity():
+    buffer = BarBuffer(capacity=4)
+    buffer.sync(make_bars(0, 3))
+    bars = make_bars(0, 10)
+    buffer.sync(bars)
+    assert_holds(buffer, bars)
+    assert buffer.capacity >= 10
+
+
+def test_fractional_volume_kept():
+    buffer = BarBuffer(capacity=4)
+    bars = [Bar(timestamp=START, open=1.0, high=2.0, low=0.5, close=1.5, volume=12.75)]
+    buffer.sync(bars)
+    assert buffer.columns()["volume"].tolist() == [12.75]
@@ -0,0 +1,98 @@
+"""Tests for api.downsampling."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api.downsampling import aggregate_candles, bucket_of, downsample_rsi
+
+
+def make_columns(count):
+    index = np.arange(count, dtype=np.float64)
+    return {
+        "timestamp": [f"t{i}" for i in range(count)],
+        "open": index,
+        "high": index + 10,
+        "low": index - 10,
+        "close": index + 0.5,
+        "volume": np.ones(count)
+    }
+
+
+def bucket_ranges(count, buckets):
+    """Bar positions in each bucket, using bucket_of()."""
+    ranges = [[] for _ in range(buckets)]
+    for i in range(count):
+        ranges[bucket_of(i, count, buckets)].append(i)
+    return ranges
+
+
+def test_bucket_of_edges():
+    assert bucket_of(0, 10, 3) == 0
+    assert bucket_of(9, 10, 3) == 2
+    assert [bucket_of(i, 10, 3) for i in range(10)] == [0, 0, 0, 0, 1, 1, 1, 2, 2, 2]
+
+
+def test_aggregate_candles_matches_buckets():
+    count, buckets = 103, 10
+    columns = make_columns(count)
+    merged = aggregate_candles(columns, buckets)
+    assert len(merged["timestamp"]) == buckets
+    for bucket, positions in enumerate(bucket_ranges(count, buckets)):
+        first, last = positions[0], positions[-1]
+        assert merged["timestamp"][bucket] == f"t{first}"
+        assert merged["open"][bucket] == columns["open"][first]
+        assert merged["close"][bucket] == columns["close"][last]
+        assert merged["high"][bucket] == columns["high"][positions].max()
+        assert merged["low"][bucket] == columns["low"][positions].min()
+        assert merged["volume"][bucket] == len(positions)
+
+
+def test_aggregate_candles_keeps_envelope_and_ends():
+    columns = make_columns(50)
+    columns["high"][17] = 1000.0
+    columns["low"][33] = -1000.0
+    merged = aggregate_candles(columns, 7)
+    assert merged["high"].max() == 1000.0
+    assert merged["low"].min() == -1000.0
+    assert merged["open"][0] == columns["open"][0]
+    assert merged["close"][-1] == columns["close"][-1]
+    assert merged["volume"].sum() == 50
+
+
+def make_points(count):
+    return [{"timestamp": f"t{i}", "rsi": 50 + 20 * np.sin(i / 3), "index": i} for i in range(count)]
+
+
+def test_downsample_rsi_keeps_ends_and_bucket_indices():
+    count, buckets = 100, 10
+    points = make_points(count)
+    sampled = downsample_rsi(points, count, buckets)
+    assert len(sampled) == buckets
+    assert sampled[0]["timestamp"] == "t0"
+    assert sampled[-1]["timestamp"] == f"t{count - 1}"
+    assert [p["index"] for p in sampled] == list(range(buckets))
+    # Each chosen point comes from the bucket its index names
+    for point in sampled:
+        source = int(point["timestamp"][1:])
+        assert bucket_of(source, count, buckets) == point["index"]
+
+
+def test_downsample_rsi_picks_spike():
+    count, buckets = 100, 10
+    points = [{"timestamp": f"t{i}", "rsi": 50.0, "index": i} for i in range(count)]
+    points[45]["rsi"] = 95.0
+    sampled = downsample_rsi(points, count, buckets)
+    assert any(point["rsi"] == 95.0 for point in sampled)
+
+
+def test_downsample_rsi_skips_missing_and_out_of_range():
+    points = make_points(20)
+    points[5]["rsi"] = None
+    points.append({"timestamp": "late", "rsi": 50.0, "index": 25})
+    sampled = downsample_rsi(points, 20, 4)
+    assert all(point["rsi"] is not None for point in sampled)
+    assert all(0 <= point["index"] < 4 for point in sampled)
+    assert downsample_rsi([], 20, 4) == []